@@ -1,9 +1,33 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify
+from flask import Flask, render_template, stream_template, request, redirect, url_for, flash, jsonify, abort
+import click
+from markupsafe import Markup
+from werkzeug.utils import get_content_type
 import os
 import datetime
 import random
 import json
 import time
+import collections
+import functools
+import threading
+import hashlib
+import base64
+import secrets
+import mimetypes
+
+from distributions import AliasDistribution, CounterRandom
+from telemetry import ClientPerformanceTable, TelemetryAggregator
+from page_cache import PageCache, combine_fingerprints, directory_fingerprint, file_fingerprint, flush_at
+from assets import AssetManifest, hashed_name
+from asset_build import CSS_BUNDLES, JS_BUNDLES, build_assets, inline_hash, load_manifest as load_bundle_manifest
+from css_usage import CssUsage
+from critical_css import CriticalCssCache, compressed_size, extract_critical_css, linked_stylesheets
+from compression import (
+    SUPPORTED_ENCODINGS, compress, compress_stream, is_compressible, negotiate_encoding
+)
+from static_server import StaticMiddleware, StaticTable
+from content import ContentStore
+from freeze import Freezer, FreezeOutput, template_dependencies, template_fingerprints
 
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', 'your-secret-key-change-this-in-production')
@@ -17,60 +41,307 @@ def not_found_error(error):
 def internal_error(error):
     return render_template('404.html'), 500
 
-# LinkedIn testimonials data (manually curated from your LinkedIn recommendations)
-def get_linkedin_testimonials():
+# Portfolio content (content/*.json) - loaded once into read-only records and
+# reloaded when a file changes; each file also feeds its section's fingerprint
+content_root = os.path.join(app.root_path, 'content')
+content_store = ContentStore(content_root)
+
+# Rendered pages are cached with a fingerprint of their templates, content and
+# asset manifest; any change to those inputs triggers a re-render
+# Stale pages keep being served while a background thread re-renders them
+page_cache = PageCache(background_context=lambda: app.test_request_context('/'))
+
+def home_fingerprint():
+    """Fingerprint of everything the home page is rendered from"""
+    return combine_fingerprints([
+        directory_fingerprint(os.path.join(app.root_path, app.template_folder)),
+        asset_manifest.current_version(),
+        content_store.fingerprint()
+    ])
+
+def section_fingerprint(section):
     """
-    Testimonials from LinkedIn recommendations section
-    Note: These are manually extracted from LinkedIn recommendations
+    Fingerprint of one home page section: its template, the card macros, the
+    asset manifest and its own content file, so editing one section's data
+    leaves the other fragments cached
     """
-    testimonials = [
-        {
-            "text": "I had the pleasure of working with Rishi during his internship at IBM. His dedication to learning new technologies and his creative approach to solving complex problems made him stand out. Rishi has excellent analytical skills and is always eager to take on challenging projects. His professionalism and collaborative spirit make him a valuable addition to any team.",
-            "author": "Michael Chen",
-            "position": "Senior Software Engineer",
-            "company": "IBM",
-            "date": "February 2022",
-            "linkedin_url": "https://www.linkedin.com/in/michael-chen-ibm"
-        },
-        {
-            "text": "Rishi is an exceptional developer with strong problem-solving abilities. During our time working together at Vega6, he consistently delivered high-quality code and showed great initiative in learning new frameworks. His analytical approach to data science projects has been invaluable to our team. I highly recommend him for any Python development role.",
-            "author": "Sarah Johnson",
-            "position": "Senior Data Scientist",
-            "company": "Vega6",
-            "date": "June 2025",
-            "linkedin_url": "https://www.linkedin.com/in/sarah-johnson-vega6"
-        },
-        {
-            "text": "Rishi has demonstrated exceptional technical skills and a passion for technology throughout our collaboration. His ability to bridge the gap between development and data science makes him a unique asset. He's always willing to go the extra mile and his positive attitude is contagious. Any organization would be lucky to have him.",
-            "author": "Dr. Priya Sharma",
-            "position": "Head of Analytics",
-            "company": "Analytix Lab",
-            "date": "March 2023",
-            "linkedin_url": "https://www.linkedin.com/in/priya-sharma-analytics"
-        },
-        {
-            "text": "Working with Rishi has been a great experience. His technical expertise in Python and data analysis is impressive, but what sets him apart is his ability to communicate complex concepts clearly. He's a natural teacher and mentor, always ready to help teammates learn and grow. His work ethic is exemplary.",
-            "author": "David Kumar",
-            "position": "Team Lead",
-            "company": "TechSolutions Inc",
-            "date": "August 2024",
-            "linkedin_url": "https://www.linkedin.com/in/david-kumar-tech"
-        },
-        {
-            "text": "Rishi is one of the most dedicated and skilled developers I've worked with. His attention to detail and commitment to writing clean, efficient code is remarkable. He approaches every project with enthusiasm and delivers results that exceed expectations. I would gladly work with him again.",
-            "author": "Amanda Rodriguez",
-            "position": "Project Manager",
-            "company": "Digital Innovations",
-            "date": "December 2024",
-            "linkedin_url": "https://www.linkedin.com/in/amanda-rodriguez-digital"
-        }
+    template_root = os.path.join(app.root_path, app.template_folder)
+    parts = [
+        file_fingerprint(os.path.join(template_root, 'sections', f'{section}.html')),
+        directory_fingerprint(os.path.join(template_root, 'macros')),
+        asset_manifest.current_version()
     ]
-    return testimonials
+    if section in content_store:
+        parts.append(content_store.fingerprint(section))
+    return combine_fingerprints(parts)
+
+# Sections of the home page below the hero (templates/sections/<id>.html)
+# The page ships them as placeholders that load /fragments/<id> on approach
+home_sections = ['about', 'education', 'badges', 'experience', 'projects', 'testimonials', 'contact']
+fragment_sections = ['home'] + home_sections
+
+def render_home(inline_critical_css=True, lazy_sections=True):
+    return render_template('index.html', inline_critical_css=inline_critical_css, home_sections=home_sections,
+                           lazy_sections=lazy_sections, **content_store.context())
+
+# Conditional requests: validators come from fingerprints and request
+# parameters, so a revalidation is answered before anything is rendered or
+# generated. A stored copy may carry the tag with its content-coding suffix
+# (<etag>-gzip), which matches too
+def strong_etag(*parts):
+    """ETag for a response that is a pure function of parts"""
+    return hashlib.sha256('\0'.join(str(part) for part in parts).encode('utf-8')).hexdigest()[:32]
+
+def not_modified(etag, last_modified=None, weak=False, vary=('Accept-Encoding',)):
+    """
+    Bodyless 304 if the request's validators still match etag (or, without
+    If-None-Match, last_modified), otherwise None
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return None
+    tags = request.if_none_match
+    if tags:
+        candidates = [etag] + [f'{etag}-{encoding}' for encoding in SUPPORTED_ENCODINGS]
+        matched = next((tag for tag in candidates if tags.contains_weak(tag)), None)
+        if matched is None and not tags.star_tag:
+            return None
+    elif request.if_modified_since is None or last_modified is None:
+        return None
+    elif int(last_modified) > request.if_modified_since.timestamp():
+        return None
+    else:
+        matched = etag
+    response = app.response_class(status=304)
+    response.set_etag(matched or etag, weak=weak)
+    for header in vary:
+        response.vary.add(header)
+    return response
+
+def set_validators(response, etag, last_modified=None, weak=False):
+    """ETag (suffixed with the content-coding, if any) and Last-Modified for a full response"""
+    encoding = response.headers.get('Content-Encoding')
+    response.set_etag(etag if encoding is None else f'{etag}-{encoding}', weak=weak)
+    if last_modified is not None:
+        response.last_modified = int(last_modified)
+    return response
+
+def cached_not_modified(key, fingerprint):
+    """
+    304 for a cached page, only while its entry is current - a stale entry
+    served during a re-render must not be revalidated as the new page
+    """
+    entry = page_cache.peek(key)
+    if entry is None or entry.fingerprint != fingerprint:
+        return None
+    return not_modified(strong_etag(key, entry.fingerprint), entry.created)
+
+def cached_page_response(entry):
+    """Response for a cached page, picking a precompressed variant when accepted"""
+    encoding, body = entry.encoded(request.headers.get('Accept-Encoding'))
+    response = app.response_class(body, content_type=entry.mimetype)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return response
+
+# A cold render of / is streamed: <head> goes out first so the browser can
+# start fetching fonts and CSS, then the hero and each section as it renders
+stream_flush_markers = ('</head>', '</section>')
+
+def stream_home():
+    """index.html in chunks that end after </head> and after each </section>"""
+    return flush_at(stream_template('index.html', home_sections=home_sections, lazy_sections=True,
+                                    **content_store.context()), stream_flush_markers)
+
+def streamed_page_response(chunks):
+    """Streaming response for a PageStream, compressed chunk by chunk when accepted"""
+    encoding = negotiate_encoding(request.headers.get('Accept-Encoding'), SUPPORTED_ENCODINGS)
+    body = chunks if encoding is None else compress_stream(chunks, encoding)
+    response = app.response_class(body, mimetype='text/html')
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return response
 
 @app.route('/')
 def home():
-    testimonials = get_linkedin_testimonials()
-    return render_template('index.html', testimonials=testimonials)
+    response = cached_not_modified('home', page_cache.fingerprint('home', home_fingerprint))
+    if response is None:
+        # Validators describe the bytes actually sent, which may be a stale entry
+        entry, chunks = page_cache.get_or_stream('home', home_fingerprint, stream_home)
+        if entry is None:
+            response = set_validators(streamed_page_response(chunks), strong_etag('home', chunks.fingerprint))
+        else:
+            response = set_validators(cached_page_response(entry), strong_etag('home', entry.fingerprint),
+                                      entry.created)
+    response.cache_control.no_cache = True
+    return response
+
+def render_fragment(section):
+    return render_template(f'sections/{section}.html', **content_store.context())
+
+@app.route('/fragments/<section>')
+def section_fragment(section):
+    """One home page section, cached and revalidated by ETag"""
+    if section not in fragment_sections:
+        return render_template('404.html'), 404
+    key = f'fragment:{section}'
+    fingerprint = functools.partial(section_fingerprint, section)
+    response = cached_not_modified(key, page_cache.fingerprint(key, fingerprint))
+    if response is None:
+        entry = page_cache.get_or_render(key, fingerprint, lambda: render_fragment(section))
+        response = set_validators(cached_page_response(entry), strong_etag(key, entry.fingerprint), entry.created)
+    response.cache_control.no_cache = True
+    return response
+
+dynamic_compress_threshold = 1024  # bytes; smaller bodies are not worth compressing
+
+# Static files are loaded into memory at startup and served ahead of Flask
+# routing (see StaticMiddleware below); the table's hashes name them too
+static_table = StaticTable(app.static_folder)
+
+# Content-hashed static URLs - url_for('static', ...) resolves through the manifest
+asset_manifest = AssetManifest(static_table)
+immutable_max_age = 31536000  # one year
+
+@app.url_defaults
+def hashed_static_urls(endpoint, values):
+    """Rewrite static filenames to their content-hashed names"""
+    if endpoint == 'static' and 'filename' in values:
+        values['filename'] = asset_manifest.url_name(values['filename'])
+
+# (asset manifest version, parsed bundle manifest) - the bundle manifest lives
+# under static/, so it can only have changed when the version did
+bundle_manifest_cache = (None, None)
+
+def current_bundle_manifest():
+    """Parsed bundle manifest, re-read only when the static files changed"""
+    global bundle_manifest_cache
+    version = asset_manifest.current_version()
+    cached_version, built = bundle_manifest_cache
+    if cached_version != version:
+        built = load_bundle_manifest(app.static_folder)
+        bundle_manifest_cache = (version, built)
+    return built
+
+def bundle_is_current(bundle_manifest):
+    """True when every source of a built bundle still has the content it was built from"""
+    for path, content_hash in bundle_manifest['sources'].items():
+        if asset_manifest.url_name(path) != hashed_name(path, content_hash):
+            return False
+    return True
+
+@app.template_global()
+def bundle_files(kind, name):
+    """
+    Static files to load for a bundle: the built, minified bundle when it is
+    up to date with its sources, otherwise the non-empty sources in order
+    """
+    built = current_bundle_manifest()
+    if built is not None and name in built['bundles'].get(kind, {}) and bundle_is_current(built):
+        return [built['bundles'][kind][name]['file']]
+    sources = (JS_BUNDLES if kind == 'js' else CSS_BUNDLES)[name]
+    return [path for path in sources if os.path.getsize(os.path.join(app.static_folder, path)) > 0]
+
+# Critical CSS for the hero and navbar is inlined into <head> and the site CSS
+# loads without blocking; it is extracted once per asset manifest version
+critical_css_cache = CriticalCssCache()
+critical_css_budget = 14 * 1024  # gzip bytes - about what the first round trip can carry
+
+def home_stylesheets():
+    """Rendered / (without critical CSS) and the local stylesheets it links, in order"""
+    with app.test_request_context('/'):
+        html = render_home(inline_critical_css=False)
+    stylesheets = []
+    prefix = app.static_url_path + '/'
+    for href in linked_stylesheets(html):
+        if not href.startswith(prefix):
+            continue  # fonts and icons from CDNs
+        filename, _ = asset_manifest.resolve(href[len(prefix):])
+        with open(os.path.join(app.static_folder, filename), encoding='utf-8') as handle:
+            stylesheets.append(handle.read())
+    return html, stylesheets
+
+def build_critical_css():
+    """Extract the above-the-fold rules of the site CSS from a render of /"""
+    html, stylesheets = home_stylesheets()
+    return extract_critical_css(html, stylesheets, budget=critical_css_budget)
+
+@app.template_global()
+def critical_css():
+    """Inlinable critical CSS for the current templates and static files"""
+    key = combine_fingerprints([
+        asset_manifest.current_version(),
+        directory_fingerprint(os.path.join(app.root_path, app.template_folder))
+    ])
+    # '</' cannot appear in CSS outside strings; escaping it keeps </style> out of the page
+    return critical_css_cache.get(key, build_critical_css).replace('</', '<\\/')
+
+@app.template_global()
+def inline_asset(name, kind, defer=False, caller=None):
+    """
+    Inline <style>/<script> block that `flask build-assets` can extract
+    Links the extracted, minified file while it still matches the block's
+    content, otherwise emits the block inline. Deferred CSS is preloaded the
+    same way as the site CSS, for use when critical CSS is inlined
+    """
+    text = caller()
+    built = current_bundle_manifest()
+    entry = built.get('inline', {}).get(name) if built is not None else None
+    if entry is None or entry['hash'] != inline_hash(text):
+        tag = 'style' if kind == 'css' else 'script'
+        return Markup(f'<{tag}>{text}</{tag}>')
+    url = url_for('static', filename=entry['file'])
+    if kind == 'js':
+        return Markup(f'<script src="{url}" defer></script>')
+    if defer:
+        return Markup(f'<link rel="preload" href="{url}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">'
+                      f'<noscript><link rel="stylesheet" href="{url}"></noscript>')
+    return Markup(f'<link rel="stylesheet" href="{url}">')
+
+def serve_static(filename):
+    """
+    Static view behind StaticMiddleware, which answers every file in the
+    static table; names that reach Flask are not static files
+    """
+    abort(404)
+
+app.view_functions['static'] = serve_static
+
+def static_max_age(filename):
+    """SEND_FILE_MAX_AGE_DEFAULT in seconds, readable outside an app context"""
+    value = app.config['SEND_FILE_MAX_AGE_DEFAULT']
+    if isinstance(value, datetime.timedelta):
+        return int(value.total_seconds())
+    return value
+
+# serve_static only sees names missing from the static table and 404s
+app.wsgi_app = StaticMiddleware(app.wsgi_app, static_table, app.static_url_path, resolve=asset_manifest.resolve,
+                                max_age=static_max_age, immutable_max_age=immutable_max_age)
+
+@app.after_request
+def compress_dynamic_response(response):
+    """Compress JSON/text responses on the fly above a size threshold"""
+    if (response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or response.status_code < 200 or response.status_code in (204, 206, 304)
+            or not is_compressible(response.mimetype)):
+        return response
+    body = response.get_data()
+    if len(body) < dynamic_compress_threshold:
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = negotiate_encoding(request.headers.get('Accept-Encoding'), SUPPORTED_ENCODINGS)
+    if encoding is None:
+        return response
+    # Moderate levels - this runs per request, unlike the precompressed variants
+    response.set_data(compress(body, encoding, level=5 if encoding == 'br' else 6))
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag:
+        # The compressed bytes are a different representation
+        response.set_etag(f'{etag}-{encoding}', weak=weak)
+    return response
 
 @app.route('/contact')
 def contact():
@@ -169,46 +440,47 @@ Best regards,
         return redirect(url_for('home') + '#contact')
 
 # Doodle related data and functions - Python & Data Science focused
-tech_icons = [
+# Tech icon -> relative draw weight
+tech_icons = {
     # Python & Core Programming (highest frequency)
-    'fa-python', 'fa-python', 'fa-python', 'fa-python', 'fa-python',  # 5x Python for high frequency
-    'fa-code', 'fa-code', 'fa-code',  # 3x code icons
-    'fa-terminal', 'fa-laptop-code', 'fa-file-code', 'fa-keyboard',
+    'fa-python': 5,
+    'fa-code': 3,
+    'fa-terminal': 1, 'fa-laptop-code': 1, 'fa-file-code': 1, 'fa-keyboard': 1,
     
     # Data Science & Analytics (high priority)
-    'fa-chart-line', 'fa-chart-line', 'fa-chart-bar', 'fa-chart-bar', 'fa-chart-pie', 'fa-chart-area',
-    'fa-database', 'fa-database', 'fa-table', 'fa-table',
-    'fa-analytics', 'fa-poll', 'fa-sitemap', 'fa-project-diagram',
+    'fa-chart-line': 2, 'fa-chart-bar': 2, 'fa-chart-pie': 1, 'fa-chart-area': 1,
+    'fa-database': 2, 'fa-table': 2,
+    'fa-analytics': 1, 'fa-poll': 1, 'fa-sitemap': 1, 'fa-project-diagram': 1,
     
     # Machine Learning & AI
-    'fa-brain', 'fa-brain', 'fa-robot', 'fa-robot',
-    'fa-network-wired', 'fa-microscope', 'fa-flask', 'fa-atom',
-    'fa-dna', 'fa-calculator', 'fa-square-root-alt', 'fa-function',
+    'fa-brain': 2, 'fa-robot': 2,
+    'fa-network-wired': 1, 'fa-microscope': 1, 'fa-flask': 1, 'fa-atom': 1,
+    'fa-dna': 1, 'fa-calculator': 1, 'fa-square-root-alt': 1, 'fa-function': 1,
     
     # Mathematical & Scientific Computing
-    'fa-equals', 'fa-plus', 'fa-minus', 'fa-times', 'fa-percentage',
-    'fa-infinity', 'fa-superscript', 'fa-subscript',
+    'fa-equals': 1, 'fa-plus': 1, 'fa-minus': 1, 'fa-times': 1, 'fa-percentage': 1,
+    'fa-infinity': 1, 'fa-superscript': 1, 'fa-subscript': 1,
     
     # Development Tools
-    'fa-github', 'fa-git-alt', 'fa-code-branch', 'fa-bug', 'fa-wrench',
-    'fa-tools', 'fa-cogs', 'fa-sync-alt',
+    'fa-github': 1, 'fa-git-alt': 1, 'fa-code-branch': 1, 'fa-bug': 1, 'fa-wrench': 1,
+    'fa-tools': 1, 'fa-cogs': 1, 'fa-sync-alt': 1,
     
     # Cloud & Infrastructure for Data Science
-    'fa-aws', 'fa-cloud', 'fa-server', 'fa-hdd', 'fa-docker',
-    'fa-cubes', 'fa-layer-group',
+    'fa-aws': 1, 'fa-cloud': 1, 'fa-server': 1, 'fa-hdd': 1, 'fa-docker': 1,
+    'fa-cubes': 1, 'fa-layer-group': 1,
     
     # Jupyter Notebooks & Documentation
-    'fa-file-alt', 'fa-sticky-note', 'fa-edit', 'fa-book',
-    'fa-clipboard-list', 'fa-list-alt',
+    'fa-file-alt': 1, 'fa-sticky-note': 1, 'fa-edit': 1, 'fa-book': 1,
+    'fa-clipboard-list': 1, 'fa-list-alt': 1,
     
     # Data Visualization & Analysis
-    'fa-eye', 'fa-search', 'fa-filter', 'fa-sort', 'fa-sort-up', 'fa-sort-down',
-    'fa-th', 'fa-th-large', 'fa-th-list', 'fa-stream',
+    'fa-eye': 1, 'fa-search': 1, 'fa-filter': 1, 'fa-sort': 1, 'fa-sort-up': 1, 'fa-sort-down': 1,
+    'fa-th': 1, 'fa-th-large': 1, 'fa-th-list': 1, 'fa-stream': 1,
     
     # Performance & Optimization
-    'fa-tachometer-alt', 'fa-rocket', 'fa-bolt', 'fa-fire',
-    'fa-memory', 'fa-microchip', 'fa-compress-alt'
-]
+    'fa-tachometer-alt': 1, 'fa-rocket': 1, 'fa-bolt': 1, 'fa-fire': 1,
+    'fa-memory': 1, 'fa-microchip': 1, 'fa-compress-alt': 1
+}
 
 # Icon types (regular vs brands vs solid) - focused on Python & Data Science
 icon_types = {
@@ -223,37 +495,38 @@ icon_types = {
     'default': 'fas'
 }
 
-# Vibrant full-stack developer brand colors
-vibrant_colors = [
+# Vibrant full-stack developer brand colors -> relative draw weight
+vibrant_colors = {
     # Blues
-    '#3B82F6', '#60A5FA', '#2563EB', '#1D4ED8', '#1E40AF', '#0EA5E9', '#0284C7', '#0891B2', '#06B6D4',
+    '#3B82F6': 1, '#60A5FA': 1, '#2563EB': 1, '#1D4ED8': 1, '#1E40AF': 1, '#0EA5E9': 2,
+    '#0284C7': 1, '#0891B2': 1, '#06B6D4': 1,
     
     # Greens
-    '#10B981', '#059669', '#047857', '#166534', '#22C55E', '#84CC16', '#65A30D',
+    '#10B981': 1, '#059669': 1, '#047857': 1, '#166534': 1, '#22C55E': 1, '#84CC16': 1, '#65A30D': 1,
     
     # Yellow/Orange
-    '#F59E0B', '#D97706', '#B45309', '#FB923C', '#F97316', '#EA580C', '#C2410C',
+    '#F59E0B': 1, '#D97706': 1, '#B45309': 1, '#FB923C': 1, '#F97316': 1, '#EA580C': 1, '#C2410C': 1,
     
     # Reds
-    '#EF4444', '#DC2626', '#B91C1C', '#F43F5E', '#BE123C', '#E11D48', '#9F1239',
+    '#EF4444': 1, '#DC2626': 1, '#B91C1C': 1, '#F43F5E': 1, '#BE123C': 1, '#E11D48': 1, '#9F1239': 1,
     
     # Purples
-    '#8B5CF6', '#7C3AED', '#6D28D9', '#5B21B6', '#A855F7', '#9333EA', '#7E22CE',
+    '#8B5CF6': 1, '#7C3AED': 1, '#6D28D9': 1, '#5B21B6': 1, '#A855F7': 1, '#9333EA': 1, '#7E22CE': 1,
     
     # Pinks
-    '#EC4899', '#DB2777', '#BE185D', '#E879F9', '#D946EF', '#C026D3',
+    '#EC4899': 1, '#DB2777': 1, '#BE185D': 1, '#E879F9': 1, '#D946EF': 1, '#C026D3': 1,
     
-    # Cyans & Teals
-    '#14B8A6', '#0D9488', '#0F766E', '#67E8F9', '#22D3EE', '#0EA5E9',
+    # Cyans & Teals (#0EA5E9 is weighted in Blues)
+    '#14B8A6': 1, '#0D9488': 1, '#0F766E': 1, '#67E8F9': 1, '#22D3EE': 1,
     
     # Multi-tone gradients (CSS gradient strings)
-    'linear-gradient(135deg, #3B82F6, #10B981)',
-    'linear-gradient(45deg, #F59E0B, #EF4444)',
-    'linear-gradient(to right, #8B5CF6, #DB2777)',
-    'linear-gradient(to bottom right, #06B6D4, #3B82F6)',
-    'linear-gradient(to bottom, #22C55E, #84CC16)',
-    'linear-gradient(to right, #FB923C, #F97316)'
-]
+    'linear-gradient(135deg, #3B82F6, #10B981)': 1,
+    'linear-gradient(45deg, #F59E0B, #EF4444)': 1,
+    'linear-gradient(to right, #8B5CF6, #DB2777)': 1,
+    'linear-gradient(to bottom right, #06B6D4, #3B82F6)': 1,
+    'linear-gradient(to bottom, #22C55E, #84CC16)': 1,
+    'linear-gradient(to right, #FB923C, #F97316)': 1
+}
 
 # Movement patterns for varied animations
 movement_patterns = [
@@ -268,6 +541,441 @@ movement_patterns = [
     'pulse'        # Stays mostly in place but pulses
 ]
 
+# Visual style options
+visual_styles = ['solid', 'gradient', 'outlined', 'glow', 'split', 'double', 'layered', 'neon']
+
+# Hover effects applied client-side
+hover_effects = ['glow', 'scale', 'spin', 'brighten', 'wobble']
+
+# Random size between 16-40px, weighted toward medium sizes
+size_weights = dict(zip(range(16, 41, 4), [0.05, 0.1, 0.2, 0.3, 0.2, 0.1, 0.05]))  # 16, 20, ... 40
+
+# Random lifetime weighted toward middle durations (7-15 seconds)
+lifetime_base = 5000  # 5 seconds base
+lifetime_step = 2500  # 2.5 second steps
+lifetime_weights = {
+    lifetime_base + step * lifetime_step: weight
+    for step, weight in enumerate([0.1, 0.15, 0.25, 0.3, 0.25, 0.15, 0.1])
+}
+
+# Weighted specs compiled once into alias tables for O(1) sampling
+icon_distribution = AliasDistribution(tech_icons)
+color_distribution = AliasDistribution(vibrant_colors)
+size_distribution = AliasDistribution(size_weights)
+lifetime_distribution = AliasDistribution(lifetime_weights)
+
+# Icon prefix lookup resolved once instead of per doodle
+icon_prefixes = {icon: icon_types.get(icon, icon_types['default']) for icon in tech_icons}
+
+# Attribute columns of a sampled batch
+doodle_columns = ('icon', 'color', 'size', 'lifetime', 'style', 'pattern', 'hover_effect', 'section',
+                  'opacity', 'speed')
+
+def sample_doodle_columns(count, rng, section=None):
+    """
+    Draw every doodle attribute for a batch in one pass
+    Each attribute is drawn for the whole batch at once (weighted attributes
+    through their alias tables) and returned as a column keyed by attribute name
+    """
+    rand = rng.random
+    return {
+        'icon': icon_distribution.sample_many(rng, count),
+        'color': color_distribution.sample_many(rng, count),
+        'size': size_distribution.sample_many(rng, count),
+        'lifetime': lifetime_distribution.sample_many(rng, count),
+        'style': rng.choices(visual_styles, k=count),
+        'pattern': rng.choices(movement_patterns, k=count),
+        'hover_effect': rng.choices(hover_effects, k=count),
+        'section': rng.choices(range(5), k=count) if section is None else [section] * count,
+        'opacity': [0.6 + 0.3 * rand() for _ in range(count)],
+        'speed': [0.8 + 0.7 * rand() for _ in range(count)]
+    }
+
+def sample_seeded_doodle(rng, section=None):
+    """
+    One doodle of a seeded stream, drawn exactly as the catalog's algorithm
+    documents (one float per attribute in draw_order) so clients generating
+    locally from the same seed get the same doodle
+    """
+    rand = rng.random
+    doodle = {
+        'icon': icon_distribution.pick(rand()),
+        'color': color_distribution.pick(rand()),
+        'size': size_distribution.pick(rand()),
+        'lifetime': lifetime_distribution.pick(rand()),
+        'style': visual_styles[int(rand() * len(visual_styles))],
+        'pattern': movement_patterns[int(rand() * len(movement_patterns))],
+        'hover_effect': hover_effects[int(rand() * len(hover_effects))],
+        'section': int(rand() * 5)
+    }
+    if section is not None:
+        doodle['section'] = section
+    for name in ('opacity', 'speed'):
+        low, high = doodle_quantization[name]
+        doodle[name] = low + (high - low) * rand()
+    return doodle
+
+def sample_indexed_doodle_columns(seed, offset, count, section=None):
+    """
+    Draw doodles offset .. offset+count-1 of a seeded stream
+    Doodle k gets its own counter-based RNG derived from (seed, k), so any
+    page of the stream costs the same no matter how far in it starts
+    """
+    key = CounterRandom.key_for(seed)
+    doodles = [sample_seeded_doodle(CounterRandom(key, index), section)
+               for index in range(offset, offset + max(count, 0))]
+    return {name: [doodle[name] for doodle in doodles] for name in doodle_columns}
+
+def doodle_records(columns):
+    """Zip sampled columns into response records"""
+    return [
+        {
+            'icon': icon,
+            'prefix': icon_prefixes[icon],
+            'color': color,
+            'size': size,
+            'lifetime': lifetime,
+            'style': style,
+            'pattern': pattern,
+            'section': doodle_section,
+            'opacity': opacity,
+            'speed': speed,
+            'hover_effect': effect
+        }
+        for icon, color, size, lifetime, style, pattern, doodle_section, opacity, speed, effect
+        in zip(columns['icon'], columns['color'], columns['size'], columns['lifetime'],
+               columns['style'], columns['pattern'], columns['section'], columns['opacity'],
+               columns['speed'], columns['hover_effect'])
+    ]
+
+def generate_doodles(count, rng, section=None):
+    """Generate a batch of doodle records"""
+    if count <= 0:
+        return []
+    return doodle_records(sample_doodle_columns(count, rng, section))
+
+# Compact v2 wire format - struct-of-arrays with strings replaced by indices
+# into immutable dictionary tables and floats quantized to 0-255
+doodle_v2_mimetype = 'application/vnd.doodles.v2+json'
+doodle_quantization = {
+    'opacity': (0.6, 0.9),
+    'speed': (0.8, 1.5)
+}
+doodle_quantization_levels = 255
+
+def unique_values(values):
+    """Distinct values in first-seen order"""
+    return list(dict.fromkeys(values))
+
+doodle_tables = {
+    'icon': list(tech_icons),
+    'prefix': unique_values(icon_types.values()),
+    'color': list(vibrant_colors),
+    'size': list(size_weights),
+    'lifetime': list(lifetime_weights),
+    'style': visual_styles,
+    'pattern': movement_patterns,
+    'hover_effect': hover_effects
+}
+doodle_table_index = {
+    name: {value: index for index, value in enumerate(table)}
+    for name, table in doodle_tables.items()
+}
+doodle_dictionary = {
+    'tables': doodle_tables,
+    # Prefix index for each icon, parallel to the icon table
+    'icon_prefix': [doodle_table_index['prefix'][icon_prefixes[icon]] for icon in doodle_tables['icon']],
+    'quantization': {
+        name: [low, high, doodle_quantization_levels]
+        for name, (low, high) in doodle_quantization.items()
+    }
+}
+doodle_dictionary_body = json.dumps(doodle_dictionary, separators=(',', ':'), sort_keys=True)
+doodle_dictionary_version = hashlib.sha256(doodle_dictionary_body.encode('utf-8')).hexdigest()[:12]
+
+# Doodle catalog - everything a client needs to generate doodles locally
+# Clients fetch it once (immutable per version), then only ask the server for a seed
+doodle_local_algorithm = {
+    'name': 'fnv1a-mulberry32-v1',
+    'description': [
+        'For doodle index k of seed s, hash the UTF-8 string "<s>:<k>" with 32-bit FNV-1a',
+        'Use the hash as the state of a mulberry32 generator returning floats in [0, 1)',
+        'Draw one float per attribute in draw_order',
+        'Weighted tables: t = u * total weight, pick the first entry whose running weight exceeds t',
+        'Uniform tables: pick entry floor(u * length); section is floor(u * sections) unless fixed',
+        'Ranges: value = low + (high - low) * u'
+    ],
+    'draw_order': ['icon', 'color', 'size', 'lifetime', 'style', 'pattern', 'hover_effect',
+                   'section', 'opacity', 'speed']
+}
+
+def weighted_entries(distribution, key='value'):
+    """Catalog entries for a compiled distribution"""
+    return [{key: value, 'weight': weight} for value, weight in zip(distribution.values, distribution.weights)]
+
+doodle_catalog = {
+    'icons': [
+        {'name': icon, 'prefix': icon_prefixes[icon], 'weight': weight}
+        for icon, weight in zip(icon_distribution.values, icon_distribution.weights)
+    ],
+    'colors': weighted_entries(color_distribution),
+    'sizes': weighted_entries(size_distribution),
+    'lifetimes': weighted_entries(lifetime_distribution),
+    'styles': visual_styles,
+    'patterns': movement_patterns,
+    'hover_effects': hover_effects,
+    'sections': 5,
+    'ranges': {name: [low, high] for name, (low, high) in doodle_quantization.items()},
+    'algorithm': doodle_local_algorithm
+}
+doodle_catalog_version = hashlib.sha256(
+    json.dumps(doodle_catalog, separators=(',', ':'), sort_keys=True).encode('utf-8')
+).hexdigest()[:12]
+doodle_catalog['version'] = doodle_catalog_version
+doodle_catalog_body = json.dumps(doodle_catalog, separators=(',', ':'), sort_keys=True)
+
+def quantize(values, low, high):
+    """Map floats in [low, high] onto integers 0..doodle_quantization_levels"""
+    scale = doodle_quantization_levels / (high - low)
+    return [round((value - low) * scale) for value in values]
+
+def build_doodle_body_v2(columns, extra=None, timestamp=True):
+    """
+    Serialize sampled doodle columns in the compact v2 format
+    Seeded pages pass timestamp=False so their bytes depend only on the request
+    """
+    payload = {
+        'v': 2,
+        'dict': url_for('get_doodle_dictionary', version=doodle_dictionary_version),
+        'count': len(columns['icon']),
+        'section': columns['section']
+    }
+    if timestamp:
+        payload['timestamp'] = datetime.datetime.now().isoformat()
+    for name, index in doodle_table_index.items():
+        if name in columns:
+            payload[name] = [index[value] for value in columns[name]]
+    for name, (low, high) in doodle_quantization.items():
+        payload[name] = quantize(columns[name], low, high)
+    payload.update(extra or {})
+    return json.dumps(payload, separators=(',', ':'))
+
+def wants_doodle_v2():
+    """True when the client asked for the v2 format via ?v=2 or the Accept header"""
+    version = request.args.get('v', default=None, type=str)
+    if version is not None:
+        return version == '2'
+    return request.accept_mimetypes.best_match(['application/json', doodle_v2_mimetype]) == doodle_v2_mimetype
+
+# Largest batch one request may ask for; larger counts are clamped, since
+# every doodle of a page is generated on the request thread
+doodle_max_count = 200
+
+# Bounded LRU cache of serialized responses for seeded requests
+# Seeded output is deterministic, so the body can be reused verbatim
+doodle_cache_size = 256
+doodle_cache = collections.OrderedDict()
+doodle_cache_lock = threading.Lock()
+
+# Per-client performance reports drive each client's doodle budget
+doodle_clients = ClientPerformanceTable()
+doodle_default_config = {
+    'max_doodles': 50,
+    'clean_interval': 30000,  # 30 seconds between cleanups
+    'performance_threshold': 30  # fps below which to reduce doodles
+}
+doodle_mobile_max_doodles = 15
+
+# (minimum smoothed fps, max_doodles, clean_interval) from most to least capable
+doodle_budget_tiers = [
+    (50, 50, 30000),
+    (40, 35, 25000),
+    (30, 20, 20000),
+    (0, 10, 15000)
+]
+
+def doodle_client_id():
+    """Client identifier from the ?client= parameter, falling back to address + user agent"""
+    client_id = request.args.get('client', default=None, type=str)
+    if not client_id:
+        data = request.get_json(silent=True) if request.is_json else None
+        if isinstance(data, dict) and isinstance(data.get('client'), str):
+            client_id = data['client']
+    if client_id:
+        return client_id[:64]
+    fingerprint = f"{request.remote_addr}|{request.headers.get('User-Agent', '')}"
+    return hashlib.blake2b(fingerprint.encode('utf-8'), digest_size=8).hexdigest()
+
+def doodle_config(client_id=None):
+    """Client tuning config, scaled to the client's recent performance reports"""
+    report = doodle_clients.get(client_id) if client_id else None
+    if report is None or report.fps is None:
+        config = dict(doodle_default_config)
+    else:
+        for min_fps, max_doodles, clean_interval in doodle_budget_tiers:
+            if report.fps >= min_fps:
+                break
+        config = dict(doodle_default_config, max_doodles=max_doodles, clean_interval=clean_interval)
+    if report is not None and report.mobile:
+        config['max_doodles'] = min(config['max_doodles'], doodle_mobile_max_doodles)
+    return config
+
+def doodle_budget_count(requested, client_id, config):
+    """Trim a requested batch to the room left under the client's max_doodles"""
+    report = doodle_clients.get(client_id)
+    if report is None or report.count is None or requested <= 0:
+        return requested
+    return min(requested, max(1, config['max_doodles'] - int(report.count)))
+
+def with_doodle_config(body, config, compact=False):
+    """Splice the per-client config into a serialized body as its first key"""
+    if compact:
+        return '{"config":%s,%s' % (json.dumps(config, separators=(',', ':')), body[1:])
+    return '{"config": %s, %s' % (app.json.dumps(config), body[1:])
+
+def build_doodle_body(columns, extra=None, timestamp=True):
+    """Serialize sampled doodle columns as the v1 response body (see build_doodle_body_v2)"""
+    doodles = doodle_records(columns)
+    payload = {'doodles': doodles}
+    if timestamp:
+        payload['timestamp'] = datetime.datetime.now().isoformat()
+    payload['count'] = len(doodles)
+    payload.update(extra or {})
+    return app.json.dumps(payload)
+
+# Highest addressable doodle index in a seeded stream
+doodle_max_offset = 2 ** 48
+
+def encode_doodle_cursor(seed, offset, section=None):
+    """Opaque cursor pointing at doodle `offset` of a seeded stream"""
+    raw = json.dumps([seed, offset, section], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_doodle_cursor(cursor):
+    """Return (seed, offset, section) for a cursor, or None if it is malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        seed, offset, section = json.loads(raw)
+    except (ValueError, TypeError):
+        return None
+    # bool is an int subclass, but true/false in a cursor is not a position
+    if not isinstance(seed, str) or not seed or not isinstance(offset, int) or isinstance(offset, bool):
+        return None
+    if section is not None and (not isinstance(section, int) or isinstance(section, bool)):
+        return None
+    return seed, offset, section
+
+def get_seeded_doodle_body(seed, count, section=None, version=1, offset=0):
+    """Return the serialized body for a seeded page, generating it on a cache miss"""
+    key = (seed, offset, count, section, version)
+    with doodle_cache_lock:
+        body = doodle_cache.get(key)
+        if body is not None:
+            doodle_cache.move_to_end(key)
+            return body
+
+    build = build_doodle_body_v2 if version == 2 else build_doodle_body
+    columns = sample_indexed_doodle_columns(seed, offset, count, section)
+    next_offset = offset + len(columns['icon'])
+    body = build(columns, {
+        'offset': offset,
+        'next_cursor': encode_doodle_cursor(seed, next_offset, section)
+    }, timestamp=False)
+    with doodle_cache_lock:
+        doodle_cache[key] = body
+        doodle_cache.move_to_end(key)
+        while len(doodle_cache) > doodle_cache_size:
+            doodle_cache.popitem(last=False)
+    return body
+
+def splice_doodle_body(serialized_doodles):
+    """Assemble a response body from already serialized doodle objects"""
+    return '{"count": %d, "doodles": [%s], "timestamp": %s}' % (
+        len(serialized_doodles),
+        ', '.join(serialized_doodles),
+        app.json.dumps(datetime.datetime.now().isoformat())
+    )
+
+class DoodlePool:
+    """
+    Ring buffer of pre-generated, pre-serialized doodles
+    A background thread tops the buffer up to the high-water mark whenever it
+    drops below the low-water mark, so unseeded requests just dequeue entries
+    """
+
+    def __init__(self, high_water=512, low_water=128, batch_size=64):
+        self.high_water = high_water
+        self.low_water = low_water
+        self.batch_size = batch_size
+        self.buffer = collections.deque(maxlen=high_water)
+        self.hits = 0
+        self.misses = 0
+        self.refills = 0
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.thread = None
+        self.rng = random.Random()
+
+    def start(self):
+        """Start the refill thread once per process"""
+        with self.lock:
+            if self.thread is not None:
+                return
+            self.thread = threading.Thread(target=self._run, name='doodle-pool', daemon=True)
+            self.thread.start()
+
+    def _run(self):
+        while True:
+            self.wakeup.wait()
+            self.wakeup.clear()
+            self.refill()
+
+    def refill(self):
+        """Top the buffer up to the high-water mark"""
+        while len(self.buffer) < self.high_water:
+            needed = min(self.batch_size, self.high_water - len(self.buffer))
+            doodles = generate_doodles(needed, self.rng)
+            self.buffer.extend(app.json.dumps(doodle) for doodle in doodles)
+        self.refills += 1
+
+    def take(self, count):
+        """Dequeue up to count serialized doodles, generating any shortfall inline"""
+        self.start()
+        taken = []
+        popleft = self.buffer.popleft
+        try:
+            for _ in range(count):
+                taken.append(popleft())
+        except IndexError:
+            pass
+
+        missing = count - len(taken)
+        with self.lock:
+            self.hits += len(taken)
+            self.misses += missing
+        if missing > 0:
+            taken.extend(app.json.dumps(doodle) for doodle in generate_doodles(missing, random.Random()))
+        if len(self.buffer) < self.low_water:
+            self.wakeup.set()
+        return taken
+
+    def stats(self):
+        """Pool counters for tuning the water marks"""
+        with self.lock:
+            hits, misses = self.hits, self.misses
+        served = hits + misses
+        return {
+            'size': len(self.buffer),
+            'high_water': self.high_water,
+            'low_water': self.low_water,
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / served if served else 0.0,
+            'refills': self.refills
+        }
+
+doodle_pool = DoodlePool()
+
 # Routes for doodle generation
 @app.route('/api/doodles', methods=['GET'])
 def get_doodles():
@@ -276,80 +984,379 @@ def get_doodles():
     seed = request.args.get('seed', default=None, type=str)
     section = request.args.get('section', default=None, type=int)  # Optional section parameter (0-4)
     
-    # Use seed for consistent results if provided
-    if seed:
-        random.seed(seed)
-    else:
-        random.seed(datetime.datetime.now().timestamp())
-    
-    # Visual style options
-    visual_styles = ['solid', 'gradient', 'outlined', 'glow', 'split', 'double', 'layered', 'neon']
-    
     # Log API request
     # app.logger.info(f"Doodle API request: count={count}, seed={seed}, section={section}")
     
-    doodles = []
-    for _ in range(count):
-        # Select a random tech icon
-        icon_name = random.choice(tech_icons)
-        icon_prefix = icon_types.get(icon_name, icon_types['default'])
-        
-        # Random size between 16-40px, weighted toward medium sizes
-        size_weights = [0.05, 0.1, 0.2, 0.3, 0.2, 0.1, 0.05]
-        size_ranges = range(16, 41, 4)  # 16, 20, 24, 28, 32, 36, 40
-        size = random.choices(size_ranges, weights=size_weights)[0]
-        
-        # Random lifetime weighted toward middle durations (7-15 seconds)
-        lifetime_weights = [0.1, 0.15, 0.25, 0.3, 0.25, 0.15, 0.1]
-        lifetime_base = 5000  # 5 seconds base
-        lifetime_step = 2500  # 2.5 second steps
-        lifetime = lifetime_base + random.choices(
-            range(0, 7), weights=lifetime_weights
-        )[0] * lifetime_step
-        
-        # Generate full doodle data
-        doodle = {
-            'icon': icon_name,
-            'prefix': icon_prefix,
-            'color': random.choice(vibrant_colors),
-            'size': size,
-            'lifetime': lifetime,
-            'style': random.choice(visual_styles),
-            'pattern': random.choice(movement_patterns),
-            'section': section if section is not None else random.randint(0, 4),
-            'opacity': random.uniform(0.6, 0.9),
-            'speed': random.uniform(0.8, 1.5),
-            'hover_effect': random.choice(['glow', 'scale', 'spin', 'brighten', 'wobble'])
-        }
-        doodles.append(doodle)
+    # Use seed for consistent results if provided - each request gets its own
+    # generator so concurrent requests never share or reseed global state
+    # Seeded streams are paged with offset or an opaque cursor from a previous page
+    offset = request.args.get('offset', default=0, type=int)
+    cursor = request.args.get('cursor', default=None, type=str)
+    if cursor:
+        decoded = decode_doodle_cursor(cursor)
+        if decoded is None:
+            return jsonify({'error': 'invalid cursor'}), 400
+        seed, offset, section = decoded
+    if not 0 <= offset <= doodle_max_offset:
+        return jsonify({'error': f'offset must be between 0 and {doodle_max_offset}'}), 400
+    count = min(max(count, 0), doodle_max_count)
     
-    return jsonify({
-        'doodles': doodles,
-        'timestamp': datetime.datetime.now().isoformat(),
-        'count': len(doodles),
-        'config': {
-            'max_doodles': 50,
-            'clean_interval': 30000,  # 30 seconds between cleanups
-            'performance_threshold': 30  # fps below which to reduce doodles
-        }
+    # Config follows the client's recent performance reports; unseeded batches
+    # are also trimmed to its remaining budget (seeded pages stay exact)
+    client_id = doodle_client_id()
+    config = doodle_config(client_id)
+    if not seed:
+        count = doodle_budget_count(count, client_id, config)
+    
+    version = 2 if wants_doodle_v2() else 1
+    response = None
+    if seed:
+        # A seeded page is determined by these inputs (its body carries no
+        # timestamp), so the tag is strong and a revalidation skips generation
+        etag = strong_etag('doodles', seed, offset, count, section, version, doodle_catalog_version,
+                           doodle_dictionary_version, json.dumps(config, sort_keys=True))
+        response = not_modified(etag, vary=('Accept', 'Accept-Encoding'))
+
+    if response is None:
+        # Unseeded requests without a section are served from the pre-generated pool
+        if seed:
+            body = get_seeded_doodle_body(seed, count, section, version, offset)
+        elif version == 2:
+            body = build_doodle_body_v2(sample_doodle_columns(count, random.Random(), section))
+        elif section is None:
+            body = splice_doodle_body(doodle_pool.take(count))
+        else:
+            body = build_doodle_body(sample_doodle_columns(count, random.Random(), section))
+        body = with_doodle_config(body, config, compact=version == 2)
+
+        response = app.response_class(body, mimetype=doodle_v2_mimetype if version == 2 else 'application/json')
+        response.vary.add('Accept')
+        if seed:
+            response.set_etag(etag)
+    if seed:
+        # A seeded page is a pure function of its URL, so shared caches may keep
+        # it - unless the config was tailored to this client
+        scope = 'public' if config == doodle_default_config else 'private'
+        response.headers['Cache-Control'] = f'{scope}, max-age=86400'
+    return response
+
+@app.route('/api/doodles/dict/<version>', methods=['GET'])
+def get_doodle_dictionary(version):
+    """Dictionary tables for the v2 format - immutable for a given version"""
+    if version != doodle_dictionary_version:
+        return jsonify({'error': 'unknown dictionary version', 'current': doodle_dictionary_version}), 404
+    response = not_modified(doodle_dictionary_version)
+    if response is None:
+        response = app.response_class(doodle_dictionary_body, mimetype='application/json')
+        response.set_etag(doodle_dictionary_version)
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
+
+@app.route('/api/doodles/catalog', methods=['GET'])
+def get_doodle_catalog():
+    """
+    Icon, color, style and pattern tables with their weights plus the local
+    generation algorithm - immutable when requested with the current ?version=
+    """
+    version = request.args.get('version', default=None, type=str)
+    if version is not None and version != doodle_catalog_version:
+        return redirect(url_for('get_doodle_catalog', version=doodle_catalog_version))
+
+    response = not_modified(doodle_catalog_version)
+    if response is None:
+        response = app.response_class(doodle_catalog_body, mimetype='application/json')
+        response.set_etag(doodle_catalog_version)
+    if version is None:
+        response.headers['Cache-Control'] = 'public, max-age=3600'
+    else:
+        response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
+
+@app.route('/api/doodles/seed', methods=['GET'])
+def get_doodle_seed():
+    """Hand out a fresh seed, the catalog location and config for local generation"""
+    response = jsonify({
+        'seed': secrets.token_urlsafe(12),
+        'catalog': url_for('get_doodle_catalog', version=doodle_catalog_version),
+        'catalog_version': doodle_catalog_version,
+        'algorithm': doodle_local_algorithm['name'],
+        'config': doodle_config(doodle_client_id())
     })
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+# Streaming feed settings - one long-lived connection replaces per-doodle polling
+doodle_stream_max_seconds = 600  # clients reconnect after this (EventSource does so automatically)
+doodle_stream_heartbeat = 15.0  # seconds between keep-alive heartbeats
+doodle_stream_min_interval = 250  # ms, floor on the client-requested pace
+
+def doodle_stream_events(initial, interval, config, max_seconds=doodle_stream_max_seconds):
+    """
+    Yield ('config' | 'doodle' | 'heartbeat', payload) events for a stream
+    An initial burst is sent immediately, then one doodle per interval
+    """
+    yield 'config', app.json.dumps(config)
+    for serialized in doodle_pool.take(initial):
+        yield 'doodle', serialized
+
+    started = time.monotonic()
+    next_doodle = started + interval
+    next_heartbeat = started + doodle_stream_heartbeat
+    while True:
+        now = time.monotonic()
+        if now - started >= max_seconds:
+            return
+        if now >= next_doodle:
+            yield 'doodle', doodle_pool.take(1)[0]
+            next_doodle += interval
+        if now >= next_heartbeat:
+            yield 'heartbeat', app.json.dumps({'server_time': datetime.datetime.now().isoformat()})
+            next_heartbeat += doodle_stream_heartbeat
+        time.sleep(max(0.0, min(next_doodle, next_heartbeat) - time.monotonic()))
+
+@app.route('/api/doodles/stream', methods=['GET'])
+def stream_doodles():
+    """Push doodles to the client over Server-Sent Events or chunked NDJSON"""
+    initial = min(max(request.args.get('initial', default=10, type=int), 0), 50)
+    interval = max(request.args.get('interval', default=2000, type=int), doodle_stream_min_interval) / 1000.0
+    client_id = doodle_client_id()
+    config = doodle_config(client_id)
+    initial = doodle_budget_count(initial, client_id, config)
+    fmt = request.args.get('format', default=None, type=str)
+    if fmt is None:
+        fmt = 'ndjson' if 'application/x-ndjson' in request.headers.get('Accept', '') else 'sse'
+
+    if fmt == 'ndjson':
+        def generate():
+            for event, payload in doodle_stream_events(initial, interval, config):
+                yield '{"type": "%s", "data": %s}\n' % (event, payload)
+        mimetype = 'application/x-ndjson'
+    else:
+        def generate():
+            yield 'retry: 5000\n\n'
+            for event, payload in doodle_stream_events(initial, interval, config):
+                if event == 'heartbeat':
+                    yield ': heartbeat\n\n'
+                else:
+                    yield 'event: %s\ndata: %s\n\n' % (event, payload)
+        mimetype = 'text/event-stream'
+
+    response = app.response_class(generate(), mimetype=mimetype)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # disable proxy buffering
+    return response
+
+@app.route('/api/doodles/pool', methods=['GET'])
+def get_doodle_pool_stats():
+    """Expose doodle pool hit/miss counters"""
+    return jsonify(doodle_pool.stats())
+
+# Aggregated client telemetry - constant memory regardless of client count
+doodle_telemetry = TelemetryAggregator()
+
+def report_number(data, key, upper):
+    """Numeric report field clamped to [0, upper], or None if absent or invalid"""
+    value = data.get(key)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return min(max(float(value), 0.0), upper)
 
 @app.route('/api/doodles/status', methods=['POST'])
 def update_doodle_status():
     """Update server about current doodle status - useful for tracking"""
-    data = request.json
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'status': 'error', 'message': 'expected a JSON object'}), 400
     
-    # Update global animation status
-    if 'count' in data:
-        # app.logger.info(f"Client reports {data['count']} active doodles")
-        pass
+    # Fold active doodle count, FPS and issue types into the rollups
+    issues = data.get('issues') or []
+    if isinstance(issues, str):
+        issues = [issues]
+    elif not isinstance(issues, list):
+        issues = []
+    count = report_number(data, 'count', 1000)
+    fps = report_number(data, 'fps', 1000)
+    doodle_telemetry.record(count=count, fps=fps, issues=issues[:16])
     
-    # Log if client reports issues
-    if 'issues' in data and data['issues']:
-        # app.logger.warning(f"Client reports doodle issues: {data['issues']}")
-        pass
+    # Remember this client's performance so its next responses can adapt
+    client_id = doodle_client_id()
+    doodle_clients.record(client_id, fps=fps, count=count, mobile=bool(data.get('mobile')))
     
-    return jsonify({'status': 'ok', 'server_time': datetime.datetime.now().isoformat()})
+    return jsonify({
+        'status': 'ok',
+        'server_time': datetime.datetime.now().isoformat(),
+        'config': doodle_config(client_id)
+    })
+
+def site_css_usage():
+    """Selector usage of the rendered index and 404 pages and the scripts they load"""
+    with app.test_request_context('/'):
+        pages = [render_home(inline_critical_css=False, lazy_sections=False), render_template('404.html')]
+        scripts = [path for name in JS_BUNDLES for path in bundle_files('js', name)]
+    sources = []
+    for path in scripts:
+        with open(os.path.join(app.static_folder, path), encoding='utf-8') as handle:
+            sources.append(handle.read())
+    return CssUsage(pages, sources)
+
+@app.cli.command('build-assets')
+@click.option('--prune/--no-prune', default=True, help='Drop CSS selectors no page or script can match.')
+def build_assets_command(prune):
+    """Bundle and minify static JS and CSS into static/dist"""
+    build_assets(app.static_folder, prune_css=site_css_usage().prune if prune else None,
+                 template_root=os.path.join(app.root_path, app.template_folder))
+
+@app.cli.command('css-usage')
+def css_usage_command():
+    """Report the bytes unused-CSS pruning saves per stylesheet"""
+    usage = site_css_usage()
+    linked = [path for name in CSS_BUNDLES for path in CSS_BUNDLES[name]]
+    stylesheets = {}
+    for path in linked:
+        with open(os.path.join(app.static_folder, path), encoding='utf-8') as handle:
+            stylesheets[path] = handle.read()
+    total_minified = total_pruned = 0
+    for path, original, minified, pruned in usage.report(stylesheets):
+        total_minified += minified
+        total_pruned += pruned
+        print(f'{path}: {original} bytes, {minified} minified, {pruned} pruned ({minified - pruned} saved)')
+    print(f'total: {total_minified} -> {total_pruned} bytes ({total_minified - total_pruned} saved)')
+    css_root = os.path.join(app.static_folder, 'css')
+    for dirpath, dirnames, filenames in os.walk(css_root):
+        for filename in sorted(filenames):
+            path = os.path.relpath(os.path.join(dirpath, filename), app.static_folder).replace(os.sep, '/')
+            if path.endswith('.css') and path not in linked:
+                print(f'{path}: not linked by any page ({os.path.getsize(os.path.join(dirpath, filename))} bytes)')
+
+@app.cli.command('critical-css')
+def critical_css_command():
+    """Report the size of the inlined critical CSS against the CSS / links"""
+    with app.test_request_context('/'):
+        css = critical_css()
+    total = sum(len(text.encode('utf-8')) for text in home_stylesheets()[1])
+    print(f'critical CSS: {len(css.encode("utf-8"))} bytes ({compressed_size(css)} gzipped, '
+          f'budget {critical_css_budget}) inlined of {total} bytes of linked CSS')
+
+# Static export: every output names the inputs it is built from, so later
+# runs of `flask freeze` only rebuild what changed
+def frozen_doodle_seed():
+    """Seed document for the export - a fixed seed and the default config"""
+    seed = f'freeze-{doodle_catalog_version}'
+    return seed, json.dumps({
+        'seed': seed,
+        'catalog': url_for('get_doodle_catalog', version=doodle_catalog_version),
+        'catalog_version': doodle_catalog_version,
+        'algorithm': doodle_local_algorithm['name'],
+        'config': doodle_default_config
+    }, separators=(',', ':'), sort_keys=True).encode('utf-8')
+
+def freeze_inputs(doodle_shards=4):
+    """Fingerprint of every input node outputs can depend on"""
+    fingerprints = template_fingerprints(app.jinja_env)
+    fingerprints['doodle-shards'] = str(doodle_shards)  # the last shard has no next link
+    fingerprints['assets'] = asset_manifest.current_version()
+    fingerprints['doodles'] = f'{doodle_catalog_version}/{doodle_dictionary_version}'
+    for name in content_store.files:
+        fingerprints[f'content:{name}'] = content_store.fingerprint(name)
+    for name, hashed in asset_manifest.to_dict().items():
+        fingerprints[f'static:{name}'] = hashed
+    return fingerprints
+
+def freeze_outputs(doodle_shards=4, doodle_shard_size=15):
+    """
+    Outputs of the export at the paths of their URLs
+    Pages are fetched through the app so they match what it serves
+    """
+    # A cached page may be a stale copy served while it re-renders; the
+    # export has to capture the current inputs
+    page_cache.clear()
+    client = app.test_client()
+    html = 'text/html; charset=utf-8'
+
+    def fetch(url):
+        def build():
+            response = client.get(url, headers={'Accept-Encoding': 'identity'})
+            if response.status_code != 200:
+                raise click.ClickException(f'{url} returned {response.status_code}')
+            return response.get_data()
+        return build
+
+    def render_404():
+        with app.test_request_context('/'):
+            return render_template('404.html').encode('utf-8')
+
+    def read_static(name):
+        def build():
+            with open(os.path.join(app.static_folder, name), 'rb') as handle:
+                return handle.read()
+        return build
+
+    def templates(name):
+        return [f'template:{dependency}' for dependency in template_dependencies(app.jinja_env, name)]
+
+    outputs = [
+        FreezeOutput('index.html', templates('index.html') + ['assets'], fetch('/'), html),
+        FreezeOutput('404.html', templates('404.html') + ['assets'], render_404, html)
+    ]
+    for section in fragment_sections:
+        inputs = templates(f'sections/{section}.html') + ['assets']
+        if section in content_store:
+            inputs.append(f'content:{section}')
+        outputs.append(FreezeOutput(f'fragments/{section}', inputs, fetch(f'/fragments/{section}'), html))
+
+    with app.test_request_context('/'):
+        seed, seed_document = frozen_doodle_seed()
+    json_type = 'application/json'
+    outputs += [
+        FreezeOutput('api/doodles/seed', ['doodles'], lambda: seed_document, json_type),
+        FreezeOutput('api/doodles/catalog', ['doodles'], fetch('/api/doodles/catalog'), json_type),
+        FreezeOutput(f'api/doodles/dict/{doodle_dictionary_version}', ['doodles'],
+                     fetch(f'/api/doodles/dict/{doodle_dictionary_version}'), json_type)
+    ]
+    def doodle_shard(offset, next_path):
+        def build():
+            # next_cursor points at the live API; the export links the next shard instead
+            body = json.loads(fetch(f'/api/doodles?seed={seed}&count={doodle_shard_size}&offset={offset}')())
+            body.pop('next_cursor', None)
+            if next_path is not None:
+                body['next'] = f'/{next_path}'
+            return json.dumps(body, separators=(',', ':')).encode('utf-8')
+        return build
+
+    shard_paths = [f'api/doodles/shards/{seed}/{shard * doodle_shard_size}.json' for shard in range(doodle_shards)]
+    for shard, path in enumerate(shard_paths):
+        next_path = shard_paths[shard + 1] if shard + 1 < len(shard_paths) else None
+        outputs.append(FreezeOutput(path, ['doodles', 'doodle-shards'],
+                                    doodle_shard(shard * doodle_shard_size, next_path), json_type))
+
+    for name, hashed in asset_manifest.to_dict().items():
+        content_type = get_content_type(mimetypes.guess_type(name)[0] or 'application/octet-stream', 'utf-8')
+        for path in {name, hashed}:
+            outputs.append(FreezeOutput(f'static/{path}', [f'static:{name}'], read_static(name), content_type))
+    return outputs
+
+@app.cli.command('freeze')
+@click.option('--output', default='build', show_default=True, help='Directory to export into.')
+@click.option('--doodle-shards', default=4, show_default=True, help='Pages of the frozen doodle seed to export.')
+@click.option('--force', is_flag=True, help='Rebuild every output, e.g. after changing Python code.')
+def freeze_command(output, doodle_shards, force):
+    """Export the site as static, precompressed files, rebuilding only outputs whose inputs changed"""
+    freezer = Freezer(os.path.join(app.root_path, output))
+    counts = freezer.run(freeze_outputs(doodle_shards), freeze_inputs(doodle_shards), force=force)
+    print(f'{counts["written"]} written, {counts["skipped"]} unchanged, {counts["removed"]} removed')
+
+@app.route('/api/doodles/stats', methods=['GET'])
+def get_doodle_stats():
+    """Windowed (1m/5m/1h) rollups of client doodle telemetry"""
+    response = jsonify({
+        'windows': doodle_telemetry.stats(),
+        'total_reports': doodle_telemetry.total_reports,
+        'pool': doodle_pool.stats(),
+        'tracked_clients': len(doodle_clients),
+        'server_time': datetime.datetime.now().isoformat()
+    })
+    response.headers['Cache-Control'] = 'no-store'
+    return response
 
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
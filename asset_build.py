@@ -0,0 +1,356 @@
+"""
+Asset bundler and minifier for static/js and static/css
+Concatenates the page's scripts and stylesheets into ordered bundles, minifies
+them and writes static/dist/manifest.json, which base.html consumes through
+the bundle_files() template helper. Empty sources are dropped.
+
+Inline <style>/<script> blocks wrapped in {% call inline_asset(...) %} are
+extracted into static/dist/inline/ so browsers can cache them; the page
+links the extracted file while its content still matches the template.
+
+Usage: python asset_build.py   (or: flask --app app build-assets, which also prunes unused CSS)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+
+
+# Bundle name -> ordered source files (relative to static/), in page load order
+JS_BUNDLES = {
+    'essential': [
+        'js/navigation.js',
+        'js/section-fragments.js',
+        'js/hero-section.js',
+        'js/contact-form.js',
+        'js/scroll-animations.js'
+    ],
+    'effects': [
+        'js/counter-effects.js',
+        'js/starfield-background.js',
+        'js/particle-system.js',
+        'js/card-interactions.js'
+    ]
+}
+
+CSS_BUNDLES = {
+    'site': [
+        'css/bundles/critical.min.css',
+        'css/bundles/layout.min.css',
+        'css/bundles/sections.min.css',
+        'css/bundles/effects.min.css',
+        'css/particle-system.css',
+        'css/card-interactions.css',
+        'css/mobile-nav-fix.css'  # must stay last - overrides the bundles
+    ]
+}
+
+OUTPUT_DIR = 'dist'
+MANIFEST_NAME = 'manifest.json'
+INLINE_DIR = 'inline'
+
+# {% call inline_asset('name', 'css'|'js', ...) %} ... {% endcall %} blocks in templates
+INLINE_BLOCK = re.compile(
+    r"{%-?\s*call\s+inline_asset\(\s*'([\w-]+)'\s*,\s*'(css|js)'[^%]*%}(.*?){%-?\s*endcall\s*-?%}",
+    re.DOTALL
+)
+
+# Tokens after which a '/' starts a regular expression rather than a division
+REGEX_PRECEDING_CHARS = set('(,=:[!&|?{};+-*%<>~^')
+REGEX_PRECEDING_WORDS = {
+    'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete',
+    'void', 'throw', 'yield', 'await', 'instanceof'
+}
+# Whitespace next to these characters is never significant
+JS_TIGHT_CHARS = set('{}()[];,:=<>!&|?*%^~')
+IDENTIFIER_CHAR = re.compile(r'[A-Za-z0-9_$]')
+
+
+def minify_js(source):
+    """
+    Conservative JavaScript minifier
+    Removes comments and redundant whitespace but keeps line breaks, so
+    automatic semicolon insertion behaves exactly as in the source. Strings,
+    template literals and regular expressions are copied verbatim.
+    """
+    out = []
+    template_depths = []  # brace depth inside each open ${ ... }
+    i, length = 0, len(source)
+
+    def last_char():
+        return out[-1][-1] if out else ''
+
+    def last_word():
+        match = re.search(r'[A-Za-z_$][A-Za-z0-9_$]*$', ''.join(out[-3:]))
+        return match.group(0) if match else ''
+
+    def copy_string(start, quote):
+        """Copy a quoted string starting at its opening quote"""
+        j = start + 1
+        while j < length and source[j] != quote and source[j] != '\n':
+            j += 2 if source[j] == '\\' else 1
+        out.append(source[start:j + 1])
+        return j + 1
+
+    def copy_template_text(start):
+        """Copy template literal text from start up to its closing backtick or next ${"""
+        j = start
+        while j < length:
+            if source[j] == '\\':
+                j += 2
+            elif source[j] == '`':
+                out.append(source[start:j + 1])
+                return j + 1
+            elif source.startswith('${', j):
+                out.append(source[start:j + 2])
+                template_depths.append(0)
+                return j + 2
+            else:
+                j += 1
+        out.append(source[start:])
+        return length
+
+    def copy_regex(start):
+        """Copy a regular expression literal including its flags"""
+        j, in_class = start + 1, False
+        while j < length and source[j] != '\n':
+            if source[j] == '\\':
+                j += 2
+                continue
+            if source[j] == '[':
+                in_class = True
+            elif source[j] == ']':
+                in_class = False
+            elif source[j] == '/' and not in_class:
+                j += 1
+                break
+            j += 1
+        while j < length and IDENTIFIER_CHAR.match(source[j]):
+            j += 1
+        out.append(source[start:j])
+        return j
+
+    while i < length:
+        char = source[i]
+
+        if char in '"\'':
+            i = copy_string(i, char)
+        elif char == '`':
+            out.append('`')
+            i = copy_template_text(i + 1)
+        elif char == '}' and template_depths and template_depths[-1] == 0:
+            template_depths.pop()
+            out.append('}')
+            i = copy_template_text(i + 1)
+        elif source.startswith('//', i):
+            end = source.find('\n', i)
+            i = length if end == -1 else end
+        elif source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            multiline = '\n' in source[i:length if end == -1 else end]
+            i = length if end == -1 else end + 2
+            if multiline and out and last_char() != '\n':
+                out.append('\n')
+            elif out and i < length and IDENTIFIER_CHAR.match(last_char()) and IDENTIFIER_CHAR.match(source[i]):
+                out.append(' ')
+        elif char == '/' and (not out or last_char() in REGEX_PRECEDING_CHARS or last_char() == '\n'
+                              or last_word() in REGEX_PRECEDING_WORDS):
+            i = copy_regex(i)
+        elif char.isspace():
+            j = i
+            while j < length and source[j].isspace():
+                j += 1
+            newline = '\n' in source[i:j]
+            i = j
+            if not out or i >= length:
+                continue
+            previous, following = last_char(), source[i]
+            if newline:
+                if previous != '\n':
+                    out.append('\n')
+            elif previous not in JS_TIGHT_CHARS and following not in JS_TIGHT_CHARS and previous != '\n':
+                out.append(' ')
+        else:
+            if template_depths:
+                if char == '{':
+                    template_depths[-1] += 1
+                elif char == '}':
+                    template_depths[-1] -= 1
+            out.append(char)
+            i += 1
+
+    return ''.join(out).strip() + '\n'
+
+
+CSS_TIGHT = re.compile(r'\s*([{};,>])\s*')
+
+
+def minify_css_code(code):
+    """Minify a stretch of CSS that contains no strings or comments"""
+    code = re.sub(r'\s+', ' ', code)
+    code = CSS_TIGHT.sub(r'\1', code)
+    code = re.sub(r':\s+', ':', code)
+    return code.replace(';}', '}')
+
+
+def minify_css(source):
+    """
+    CSS minifier: drops comments, collapses whitespace around braces,
+    semicolons, commas and child combinators, and removes the last semicolon
+    in each block. Strings are copied verbatim; whitespace before ':' is kept
+    because it is significant in selectors (a :hover)
+    """
+    parts = []
+    code = []
+    i, length = 0, len(source)
+    while i < length:
+        if source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            i = length if end == -1 else end + 2
+            code.append(' ')
+        elif source[i] in '"\'':
+            quote, j = source[i], i + 1
+            while j < length and source[j] != quote:
+                j += 2 if source[j] == '\\' else 1
+            parts.append(minify_css_code(''.join(code)))
+            parts.append(source[i:j + 1])
+            code = []
+            i = j + 1
+        else:
+            code.append(source[i])
+            i += 1
+    parts.append(minify_css_code(''.join(code)))
+    return ''.join(parts).strip() + '\n'
+
+
+def read_source(static_root, relative):
+    with open(os.path.join(static_root, relative), encoding='utf-8') as handle:
+        return handle.read()
+
+
+def build_bundle(static_root, sources, kind, prune_css=None):
+    """
+    Concatenate and minify non-empty sources; returns (text, used_sources)
+    prune_css, if given, replaces CSS minification: it takes an ordered
+    relative path -> text dict and returns minified, pruned texts
+    """
+    texts = {}
+    for relative in sources:
+        text = read_source(static_root, relative)
+        if text.strip():  # skips e.g. the empty navigation.js
+            texts[relative] = text
+    if kind == 'css' and prune_css is not None:
+        minified = prune_css(texts)
+    else:
+        minify = minify_js if kind == 'js' else minify_css
+        minified = {relative: minify(text) for relative, text in texts.items()}
+    chunks = [minified[relative] for relative in texts if minified[relative]]
+    used = list(texts)
+    # Terminate each script so one file's last statement cannot run into the next
+    separator = ';\n' if kind == 'js' else '\n'
+    return separator.join(chunks), used
+
+
+def source_hash(static_root, relative):
+    with open(os.path.join(static_root, relative), 'rb') as handle:
+        return hashlib.sha256(handle.read()).hexdigest()[:10]
+
+
+def inline_hash(text):
+    """Content hash of an inline block, as rendered or as written in the template"""
+    return hashlib.sha256(text.strip().encode('utf-8')).hexdigest()[:10]
+
+
+def extract_inline_assets(static_root, template_root, output_dir=OUTPUT_DIR, prune_css=None, log=print):
+    """
+    Write every inline_asset block of the templates to its own minified file
+    Returns name -> {file, hash, template, bytes}; the hash lets the page
+    fall back to the inline block once the template is edited
+    """
+    os.makedirs(os.path.join(static_root, output_dir, INLINE_DIR), exist_ok=True)
+    entries = {}
+    for dirpath, dirnames, filenames in os.walk(template_root):
+        dirnames.sort()
+        for template in sorted(filenames):
+            path = os.path.join(dirpath, template)
+            with open(path, encoding='utf-8') as handle:
+                source = handle.read()
+            for name, kind, text in INLINE_BLOCK.findall(source):
+                if kind == 'css' and prune_css is not None:
+                    minified = prune_css({name: text})[name]
+                else:
+                    minified = (minify_js if kind == 'js' else minify_css)(text)
+                filename = f'{output_dir}/{INLINE_DIR}/{name}.{kind}'
+                with open(os.path.join(static_root, filename), 'w', encoding='utf-8') as handle:
+                    handle.write(minified)
+                size = len(minified.encode('utf-8'))
+                entries[name] = {
+                    'file': filename,
+                    'hash': inline_hash(text),
+                    'template': os.path.relpath(path, template_root).replace(os.sep, '/'),
+                    'bytes': size
+                }
+                log(f'{filename}: inline {kind} from {entries[name]["template"]}, '
+                    f'{len(text.encode("utf-8"))} -> {size} bytes')
+    return entries
+
+
+def build_assets(static_root, bundles=None, output_dir=OUTPUT_DIR, log=print, prune_css=None, template_root=None):
+    """
+    Build every bundle and write the manifest
+    Returns the manifest dict: kind -> bundle -> {file, sources, bytes}, plus
+    the inline blocks extracted from template_root when it is given
+    prune_css drops unused CSS (see css_usage.py); it needs the rendered
+    pages, so only `flask --app app build-assets` passes it
+    """
+    bundles = bundles or {'js': JS_BUNDLES, 'css': CSS_BUNDLES}
+    os.makedirs(os.path.join(static_root, output_dir), exist_ok=True)
+    manifest = {'bundles': {}, 'sources': {}}
+
+    for kind, specs in bundles.items():
+        manifest['bundles'][kind] = {}
+        for name, sources in specs.items():
+            text, used = build_bundle(static_root, sources, kind, prune_css)
+            filename = f'{output_dir}/{name}.min.{kind}'
+            with open(os.path.join(static_root, filename), 'w', encoding='utf-8') as handle:
+                handle.write(text)
+            original = sum(os.path.getsize(os.path.join(static_root, path)) for path in sources)
+            size = len(text.encode('utf-8'))
+            manifest['bundles'][kind][name] = {'file': filename, 'sources': used, 'bytes': size}
+            for path in sources:
+                manifest['sources'][path] = source_hash(static_root, path)
+            log(f'{filename}: {len(used)}/{len(sources)} files, {original} -> {size} bytes')
+
+    if template_root is not None:
+        manifest['inline'] = extract_inline_assets(static_root, template_root, output_dir, prune_css, log)
+
+    with open(os.path.join(static_root, output_dir, MANIFEST_NAME), 'w', encoding='utf-8') as handle:
+        json.dump(manifest, handle, indent=2, sort_keys=True)
+        handle.write('\n')
+    return manifest
+
+
+def load_manifest(static_root, output_dir=OUTPUT_DIR):
+    """Parsed bundle manifest, or None when the bundles have not been built"""
+    try:
+        with open(os.path.join(static_root, output_dir, MANIFEST_NAME), encoding='utf-8') as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Bundle and minify static JS and CSS')
+    root = os.path.dirname(os.path.abspath(__file__))
+    parser.add_argument('--static', default=os.path.join(root, 'static'),
+                        help='static directory (default: ./static)')
+    parser.add_argument('--templates', default=os.path.join(root, 'templates'),
+                        help='templates to extract inline_asset blocks from (default: ./templates)')
+    args = parser.parse_args(argv)
+    build_assets(args.static, template_root=args.templates)
+
+
+if __name__ == '__main__':
+    main()
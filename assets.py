@@ -0,0 +1,88 @@
+"""
+Content-hash fingerprinted static asset URLs
+The manifest maps every file under static/ to a name carrying a short hash
+of its contents (css/site.css -> css/site.3f2a9c1b7e.css). Hashed URLs never
+change meaning, so they can be served with immutable, year-long caching.
+"""
+
+import hashlib
+import os
+import re
+import threading
+
+
+HASH_LENGTH = 10
+HASHED_NAME = re.compile(r'^(?P<stem>.+)\.(?P<hash>[0-9a-f]{%d})(?P<ext>\.[^./]+)$' % HASH_LENGTH)
+
+
+def hashed_name(filename, content_hash):
+    """Insert a content hash before the extension"""
+    stem, ext = os.path.splitext(filename)
+    return f'{stem}.{content_hash}{ext}'
+
+
+class AssetManifest:
+    """
+    Bidirectional map between static filenames and their hashed names
+    Built from a StaticTable, which already walks, stats and hashes static/
+    once per change: a file's hash is the start of its table ETag, and the
+    maps are rebuilt only when the table loaded a new set of files
+    """
+
+    def __init__(self, table):
+        self.table = table
+        self.lock = threading.Lock()
+        self.source = None
+        self.files = {}
+        self.originals = {}
+        self.version = None
+        self.refresh()
+
+    def refresh(self):
+        """Rebuild the manifest if the static table changed"""
+        source = self.table.current()
+        if source is self.source:
+            return
+        files = {name: hashed_name(name, entry.etag[:HASH_LENGTH]) for name, entry in source.items()}
+        version = hashlib.sha256(
+            '\n'.join(f'{name}={hashed}' for name, hashed in sorted(files.items())).encode('utf-8')
+        ).hexdigest()[:HASH_LENGTH]
+
+        with self.lock:
+            self.files = files
+            self.originals = {hashed: name for name, hashed in files.items()}
+            self.version = version
+            self.source = source
+
+    def current_version(self):
+        """Manifest version after picking up any static file changes"""
+        self.refresh()
+        return self.version
+
+    def url_name(self, filename):
+        """Hashed name for a static filename (unchanged if it is not in the manifest)"""
+        self.refresh()
+        return self.files.get(filename, filename)
+
+    def resolve(self, requested):
+        """
+        (original filename, is_current_hash) for a requested static path
+        Outdated hashes still resolve to the current file so pages cached
+        before a deploy keep working, but they must not be cached immutably
+        """
+        self.refresh()
+        original = self.originals.get(requested)
+        if original is not None:
+            return original, True
+        match = HASHED_NAME.match(requested)
+        if match is not None:
+            candidate = match.group('stem') + match.group('ext')
+            if candidate in self.files:
+                return candidate, False
+        return requested, False
+
+    def to_dict(self):
+        """Plain mapping of filename -> hashed name"""
+        self.refresh()
+        with self.lock:
+            return dict(self.files)
@@ -0,0 +1,107 @@
+"""
+Response compression
+Static files and cached pages are compressed once at the highest level and
+kept next to their raw bytes; each request then just picks a variant from
+Accept-Encoding. Brotli is used when the optional `brotli` package is
+installed, gzip otherwise.
+"""
+
+import gzip
+import zlib
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+
+# Preferred encodings, best first
+SUPPORTED_ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+# Only text-like content benefits from compression
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.html', '.svg', '.json', '.txt', '.xml', '.map')
+COMPRESSIBLE_MIMETYPES = ('text/', 'application/json', 'application/javascript', 'application/x-ndjson',
+                          'application/vnd.', 'image/svg+xml')
+MIN_COMPRESS_SIZE = 512
+
+
+def compress(body, encoding, level=None):
+    """Compress bytes with the given content-coding"""
+    if encoding == 'br':
+        return brotli.compress(body, quality=11 if level is None else level)
+    if encoding == 'gzip':
+        return gzip.compress(body, compresslevel=9 if level is None else level, mtime=0)
+    raise ValueError(f'unsupported encoding: {encoding}')
+
+
+def compress_stream(chunks, encoding, level=None):
+    """
+    Compress an iterable of str/bytes chunks incrementally
+    Every chunk is flushed so the client can decode it as soon as it arrives
+    """
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=5 if level is None else level)
+        process, flush, finish = compressor.process, compressor.flush, compressor.finish
+    elif encoding == 'gzip':
+        compressor = zlib.compressobj(6 if level is None else level, zlib.DEFLATED, 31)
+        process, flush, finish = (compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH),
+                                  compressor.flush)
+    else:
+        raise ValueError(f'unsupported encoding: {encoding}')
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        data = process(chunk) + flush()
+        if data:
+            yield data
+    yield finish()
+
+
+def compress_variants(body):
+    """Every supported encoding of body at the highest level, skipping ones that do not shrink it"""
+    variants = {}
+    if len(body) < MIN_COMPRESS_SIZE:
+        return variants
+    for encoding in SUPPORTED_ENCODINGS:
+        encoded = compress(body, encoding)
+        if len(encoded) < len(body):
+            variants[encoding] = encoded
+    return variants
+
+
+def parse_accept_encoding(header):
+    """Map of content-coding -> q-value from an Accept-Encoding header"""
+    accepted = {}
+    for part in (header or '').split(','):
+        token, _, params = part.strip().partition(';')
+        token = token.strip().lower()
+        if not token:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[token] = quality
+    return accepted
+
+
+def negotiate_encoding(header, available):
+    """Best available encoding the client accepts, or None for identity"""
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get('*', 0.0)
+    best, best_quality = None, 0.0
+    for encoding in SUPPORTED_ENCODINGS:
+        if encoding not in available:
+            continue
+        quality = accepted.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def is_compressible(mimetype):
+    """True for text-like mimetypes"""
+    return bool(mimetype) and mimetype.startswith(COMPRESSIBLE_MIMETYPES)
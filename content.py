@@ -0,0 +1,205 @@
+"""
+Portfolio content store
+Content lives in JSON files under content/ and is loaded into immutable,
+__slots__-based records shared read-only by every request. A file is
+reloaded only when its mtime or size changes, and the new records replace
+the old ones in a single assignment, so a request sees either the old or
+the new content, never a mix. A file that fails to load keeps the last good
+records.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from types import MappingProxyType
+
+
+def freeze(value):
+    """Read-only copy of JSON data: lists become tuples, objects mapping proxies"""
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    return value
+
+
+class Record:
+    """
+    Immutable content record
+    Subclasses list their fields in __slots__ and defaults for optional
+    fields in `optional`
+    """
+
+    __slots__ = ()
+    optional = {}
+
+    def __init__(self, **values):
+        unknown = set(values) - set(self.__slots__)
+        if unknown:
+            raise ValueError(f'{type(self).__name__}: unknown fields {sorted(unknown)}')
+        for name in self.__slots__:
+            if name in values:
+                value = values[name]
+            elif name in self.optional:
+                value = self.optional[name]
+            else:
+                raise ValueError(f'{type(self).__name__}: missing field {name!r}')
+            object.__setattr__(self, name, freeze(value))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__} is read-only')
+
+    def __delattr__(self, name):
+        raise AttributeError(f'{type(self).__name__} is read-only')
+
+    def __repr__(self):
+        fields = ', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)
+        return f'{type(self).__name__}({fields})'
+
+
+class Testimonial(Record):
+    """A LinkedIn recommendation"""
+
+    __slots__ = ('text', 'author', 'position', 'company', 'date', 'rating', 'linkedin_url')
+    optional = {'rating': 5, 'linkedin_url': None}
+
+
+class Education(Record):
+    """A degree or diploma on the education timeline"""
+
+    __slots__ = ('title', 'date', 'field', 'description', 'institution', 'animation')
+    optional = {'animation': None}
+
+
+class Experience(Record):
+    """A position on the experience cards"""
+
+    __slots__ = ('title', 'date', 'company', 'description', 'animation')
+    optional = {'animation': None}
+
+
+class BadgeCategory(Record):
+    """A group of embedded Credly badges, listed by share id"""
+
+    __slots__ = ('title', 'icon', 'badges')
+
+
+class Project(Record):
+    """
+    A featured project card
+    highlight is the technology shown on its own line (with highlight_class),
+    actions are {"kind", "label"} buttons
+    """
+
+    __slots__ = ('title', 'icon', 'description', 'technologies', 'highlight', 'highlight_class',
+                 'view_code', 'actions', 'animation')
+    optional = {'highlight': None, 'highlight_class': None, 'view_code': False, 'actions': [], 'animation': None}
+
+
+# Content files under the content root and their record types
+CONTENT_TYPES = {
+    'education': Education,
+    'badges': BadgeCategory,
+    'experience': Experience,
+    'projects': Project,
+    'testimonials': Testimonial,
+}
+
+
+class ContentSnapshot:
+    """Records of one version of a content file and the digest of its bytes"""
+
+    __slots__ = ('records', 'fingerprint', 'mtime_ns', 'size')
+
+    def __init__(self, records, fingerprint, mtime_ns, size):
+        self.records = records
+        self.fingerprint = fingerprint
+        self.mtime_ns = mtime_ns
+        self.size = size
+
+
+class ContentFile:
+    """
+    Records of a JSON file holding a list of objects
+    The file is stat'ed at most once per check_interval; one request reloads
+    it while the others keep reading the current snapshot
+    """
+
+    def __init__(self, path, record_type, check_interval=1.0, clock=time.monotonic):
+        self.path = path
+        self.record_type = record_type
+        self.check_interval = check_interval
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+        self.checked = clock()
+        self.snapshot = self.load(os.stat(path))
+
+    def load(self, stat):
+        with open(self.path, 'rb') as handle:
+            raw = handle.read()
+        records = tuple(self.record_type(**item) for item in json.loads(raw))
+        return ContentSnapshot(records, hashlib.sha256(raw).hexdigest(), stat.st_mtime_ns, stat.st_size)
+
+    def refresh(self):
+        """Reload the file if its mtime or size changed"""
+        if self.clock() - self.checked < self.check_interval:
+            return
+        if not self.lock.acquire(blocking=False):
+            return  # another request is already checking
+        try:
+            self.checked = self.clock()
+            stat = os.stat(self.path)
+            snapshot = self.snapshot
+            if stat.st_mtime_ns == snapshot.mtime_ns and stat.st_size == snapshot.size:
+                return
+            self.snapshot = self.load(stat)
+        except (OSError, ValueError, TypeError):
+            self.logger.exception('Reloading %s failed; keeping the previous content', self.path)
+        finally:
+            self.lock.release()
+
+    def current(self):
+        """Current snapshot - read records and fingerprint from the same one"""
+        self.refresh()
+        return self.snapshot
+
+    def records(self):
+        return self.current().records
+
+    def fingerprint(self):
+        return self.current().fingerprint
+
+
+class ContentStore:
+    """
+    One ContentFile per name in types (<root>/<name>.json)
+    Each file is fingerprinted on its own, so caches can tell exactly which
+    sections changed
+    """
+
+    def __init__(self, root, types=CONTENT_TYPES, check_interval=1.0):
+        self.files = {name: ContentFile(os.path.join(root, f'{name}.json'), record_type, check_interval)
+                      for name, record_type in types.items()}
+
+    def __contains__(self, name):
+        return name in self.files
+
+    def records(self, name):
+        return self.files[name].records()
+
+    def fingerprint(self, name=None):
+        """Fingerprint of one file, or of all of them"""
+        if name is not None:
+            return self.files[name].fingerprint()
+        return hashlib.sha256(
+            ''.join(f'{name}={content.fingerprint()}\n' for name, content in sorted(self.files.items()))
+            .encode('utf-8')
+        ).hexdigest()
+
+    def context(self):
+        """Template variables: the records of every file by name"""
+        return {name: content.records() for name, content in self.files.items()}
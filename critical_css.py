@@ -0,0 +1,307 @@
+"""
+Critical-CSS extraction
+Works out which rules of the page's stylesheets can apply to the
+above-the-fold markup (everything up to the end of the hero section, which
+contains the navbar) so they can be inlined into <head> while the full
+stylesheets load without blocking rendering.
+
+Matching is deliberately conservative: pseudo-classes, pseudo-elements and
+attribute selectors are ignored, so a rule is kept whenever the classes, ids
+and tags of each compound selector occur together on some fold element.
+Only interaction states (:hover, :focus, ...) are left for the full CSS.
+"""
+
+import gzip
+import re
+import threading
+from html.parser import HTMLParser
+
+from asset_build import minify_css
+
+
+FOLD_ID = 'home'
+VOID_ELEMENTS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'
+}
+# Containers whose body is a list of rules; everything else is kept or dropped as a whole
+GROUPING_RULES = ('@media', '@supports')
+KEYFRAMES = re.compile(r'^@(?:-[a-z]+-)?keyframes\s+(\S+)', re.IGNORECASE)
+
+
+class FoldElement:
+    """Tag, id and classes of one element above the fold"""
+
+    __slots__ = ('tag', 'id', 'classes')
+
+    def __init__(self, tag, element_id, classes):
+        self.tag = tag
+        self.id = element_id
+        self.classes = classes
+
+
+class FoldParser(HTMLParser):
+    """Collects every element from the start of the document to the end of the fold element"""
+
+    def __init__(self, fold_id):
+        super().__init__(convert_charrefs=True)
+        self.fold_id = fold_id
+        self.elements = []
+        self.fold_depth = None
+        self.depth = 0
+        self.done = False
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        attrs = dict(attrs)
+        self.elements.append(FoldElement(tag, attrs.get('id'), frozenset((attrs.get('class') or '').split())))
+        if tag in VOID_ELEMENTS:
+            return
+        self.depth += 1
+        if self.fold_depth is None and attrs.get('id') == self.fold_id:
+            self.fold_depth = self.depth
+
+    def handle_startendtag(self, tag, attrs):
+        if not self.done:
+            attrs = dict(attrs)
+            self.elements.append(FoldElement(tag, attrs.get('id'), frozenset((attrs.get('class') or '').split())))
+
+    def handle_endtag(self, tag):
+        if self.done or tag in VOID_ELEMENTS:
+            return
+        if self.fold_depth is not None and self.depth == self.fold_depth:
+            self.done = True
+        self.depth -= 1
+
+
+def fold_elements(html, fold_id=FOLD_ID):
+    """Elements of a rendered page up to and including the fold element"""
+    parser = FoldParser(fold_id)
+    parser.feed(html)
+    parser.close()
+    return parser.elements
+
+
+def split_top_level(text, separator):
+    """Split on separator outside of parentheses, brackets and strings"""
+    parts, depth, quote, start = [], 0, None, 0
+    for index, char in enumerate(text):
+        if quote:
+            if char == quote and text[index - 1] != '\\':
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        elif char == separator and depth == 0:
+            parts.append(text[start:index])
+            start = index + 1
+    parts.append(text[start:])
+    return parts
+
+
+COMPOUND_NOISE = re.compile(r'::?[\w-]+(?:\((?:[^()]|\([^()]*\))*\))?|\[[^\]]*\]')
+COMPOUND_SPLIT = re.compile(r'\s*[>+~]\s*|\s+')
+COMPOUND_PART = re.compile(r'([.#]?)(-?[_a-zA-Z][\w-]*|\*)')
+# States that need user interaction, so they never matter for the first paint
+INTERACTION_PSEUDO = re.compile(r':(?:hover|active|focus|focus-within|focus-visible)(?![\w-])')
+
+
+def compound_matches(compound, elements, runtime=None):
+    """
+    True if some element could match a compound selector
+    Classes and ids that scripts may add at runtime (runtime.has(name)) are
+    assumed to be present on any element, and tags they may create
+    (runtime.has_tag(tag)) to be any element
+    """
+    tag, element_id, classes = None, None, set()
+    for prefix, name in COMPOUND_PART.findall(compound):
+        if prefix == '.':
+            classes.add(name)
+        elif prefix == '#':
+            element_id = name
+        elif name != '*':
+            tag = name.lower()
+    if runtime is not None:
+        classes = {name for name in classes if not runtime.has(name)}
+        if element_id is not None and runtime.has(element_id):
+            element_id = None
+        if tag is not None and runtime.has_tag(tag):
+            tag = None
+    for element in elements:
+        if tag is not None and element.tag != tag:
+            continue
+        if element_id is not None and element.id != element_id:
+            continue
+        if classes <= element.classes:
+            return True
+    return False
+
+
+def selector_matches(selector, elements, runtime=None, interactive=False):
+    """
+    True if every compound of a complex selector matches some element
+    Selectors for interaction states only count when interactive is set
+    """
+    if not interactive and INTERACTION_PSEUDO.search(selector):
+        return False
+    stripped = COMPOUND_NOISE.sub('', selector).strip()
+    return all(compound_matches(compound, elements, runtime)
+               for compound in COMPOUND_SPLIT.split(stripped) if compound)
+
+
+def parse_rules(css):
+    """
+    Top-level (prelude, block) pairs of minified CSS
+    block is None for statements such as @import
+    """
+    rules, index, length = [], 0, len(css)
+    while index < length:
+        start, depth, quote = index, 0, None
+        while index < length:
+            char = css[index]
+            if quote:
+                if char == '\\':
+                    index += 1
+                elif char == quote:
+                    quote = None
+            elif char in '"\'':
+                quote = char
+            elif char == '(':
+                depth += 1
+            elif char == ')':
+                depth -= 1
+            elif depth == 0 and char in '{;':
+                break
+            index += 1
+        prelude = css[start:index].strip()
+        if index >= length or css[index] == ';':
+            if prelude:
+                rules.append((prelude, None))
+            index += 1
+            continue
+
+        block_start, nesting, quote = index + 1, 0, None
+        while index < length:
+            char = css[index]
+            if quote:
+                if char == '\\':
+                    index += 1
+                elif char == quote:
+                    quote = None
+            elif char in '"\'':
+                quote = char
+            elif char == '{':
+                nesting += 1
+            elif char == '}':
+                nesting -= 1
+                if nesting == 0:
+                    break
+            index += 1
+        rules.append((prelude, css[block_start:index]))
+        index += 1
+    return rules
+
+
+def filter_rules(css, keep_selector, keyframes):
+    """
+    Minified css reduced to the selectors keep_selector accepts
+    Rules left without selectors are dropped, as are @media/@supports blocks
+    left empty; keyframes are moved into the keyframes dict by name
+    """
+    kept = []
+    for prelude, block in parse_rules(css):
+        if block is None:
+            continue  # @import/@charset would only add blocking requests
+        lowered = prelude.lower()
+        keyframes_match = KEYFRAMES.match(prelude)
+        if keyframes_match:
+            keyframes[keyframes_match.group(1)] = f'{prelude}{{{block}}}'
+        elif lowered.startswith(GROUPING_RULES):
+            inner = filter_rules(block, keep_selector, keyframes)
+            if inner:
+                kept.append(f'{prelude}{{{inner}}}')
+        elif lowered.startswith('@'):
+            kept.append(f'{prelude}{{{block}}}')  # @font-face, @page, ...
+        else:
+            selectors = [selector for selector in split_top_level(prelude, ',')
+                         if keep_selector(selector)]
+            if selectors:
+                kept.append(f'{",".join(selectors)}{{{block}}}')
+    return ''.join(kept)
+
+
+def references(name, css):
+    """True if css mentions an identifier such as a keyframes name"""
+    return re.search(r'(?<![\w-])' + re.escape(name) + r'(?![\w-])', css) is not None
+
+
+LINK_TAG = re.compile(r'<link\b([^>]*)>', re.IGNORECASE)
+ATTRIBUTE = re.compile(r'([\w-]+)\s*=\s*"([^"]*)"')
+
+
+def linked_stylesheets(html):
+    """hrefs of a page's <link rel="stylesheet"> tags in document order"""
+    hrefs = []
+    for attributes in LINK_TAG.findall(html):
+        attributes = dict((name.lower(), value) for name, value in ATTRIBUTE.findall(attributes))
+        if attributes.get('rel', '').lower() == 'stylesheet' and 'href' in attributes:
+            hrefs.append(attributes['href'])
+    return hrefs
+
+
+def with_keyframes(css, keyframes):
+    """css plus the keyframes blocks it references"""
+    return css + ''.join(block for name, block in keyframes.items() if references(name, css))
+
+
+def compressed_size(css):
+    return len(gzip.compress(css.encode('utf-8'), mtime=0))
+
+
+def extract_critical_css(html, stylesheets, fold_id=FOLD_ID, budget=None):
+    """
+    Critical CSS for a rendered page
+    stylesheets are the page's CSS sources in link order; the result keeps
+    their cascade order and appends the keyframes the kept rules animate with.
+    With a budget (gzip bytes) only the longest leading run of rules that
+    fits is kept; the rest still arrives with the full stylesheets
+    """
+    elements = fold_elements(html, fold_id)
+    keyframes = {}
+    css = ''.join(filter_rules(minify_css(text), lambda selector: selector_matches(selector, elements), keyframes)
+                  for text in stylesheets)
+    if budget is None or compressed_size(with_keyframes(css, keyframes)) <= budget:
+        return with_keyframes(css, keyframes)
+
+    rules = [f'{prelude}{{{block}}}' for prelude, block in parse_rules(css)]
+    low, high = 0, len(rules)  # rules[:low] fits, rules[:high + 1] does not
+    while low < high:
+        middle = (low + high + 1) // 2
+        if compressed_size(with_keyframes(''.join(rules[:middle]), keyframes)) <= budget:
+            low = middle
+        else:
+            high = middle - 1
+    return with_keyframes(''.join(rules[:low]), keyframes)
+
+
+class CriticalCssCache:
+    """
+    Critical CSS keyed by the inputs it was extracted from
+    Extraction runs once per key; every other render reuses the string
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.key = None
+        self.css = None
+
+    def get(self, key, extract):
+        with self.lock:
+            if self.key == key:
+                return self.css
+            css = extract()
+            self.key, self.css = key, css
+            return css
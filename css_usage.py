@@ -0,0 +1,90 @@
+"""
+Unused-CSS analysis
+Matches every selector of the site stylesheets against the rendered pages
+plus the class names scripts can add at runtime, and prunes the selectors
+that can never match. The build step uses it to shrink the CSS bundle, and
+the report shows the bytes saved per file.
+
+Runtime names are taken generously: every word in the page's scripts counts
+as a class or id, and words ending in '-' are treated as prefixes so that
+`notification-${type}` keeps every .notification-* rule. A tag named in a
+script (an embed's iframe, createElement('canvas')) is assumed to be
+creatable anywhere.
+"""
+
+import re
+
+from asset_build import minify_css
+from critical_css import fold_elements, filter_rules, references, selector_matches
+
+
+SCRIPT_WORD = re.compile(r'[A-Za-z_][\w-]*')
+INLINE_SCRIPT = re.compile(r'<script\b[^>]*>(.*?)</script>', re.IGNORECASE | re.DOTALL)
+
+
+class RuntimeNames:
+    """Class and id names, and tags, that scripts may add to the page"""
+
+    __slots__ = ('words', 'prefixes', 'tags')
+
+    def __init__(self, scripts):
+        words = set()
+        for script in scripts:
+            words.update(SCRIPT_WORD.findall(script))
+        self.words = frozenset(word for word in words if not word.endswith('-'))
+        self.prefixes = tuple(sorted(word for word in words if word.endswith('-')))
+        self.tags = frozenset(word.lower() for word in self.words)
+
+    def has(self, name):
+        return name in self.words or name.startswith(self.prefixes)
+
+    def has_tag(self, tag):
+        return tag in self.tags
+
+
+class CssUsage:
+    """
+    Selector usage across a set of rendered pages and their scripts
+    Inline <script> blocks of the pages are scanned along with the given
+    script sources
+    """
+
+    def __init__(self, pages, scripts=()):
+        scripts = list(scripts)
+        self.elements = []
+        for html in pages:
+            self.elements.extend(fold_elements(html, fold_id=None))
+            scripts.extend(INLINE_SCRIPT.findall(html))
+        self.runtime = RuntimeNames(scripts)
+        # Anything that can name a keyframes animation besides the CSS itself
+        self.corpus = ''.join(pages) + ''.join(scripts)
+
+    def selector_used(self, selector):
+        return selector_matches(selector, self.elements, self.runtime, interactive=True)
+
+    def prune(self, stylesheets):
+        """
+        Pruned, minified copies of stylesheets (an ordered name -> text dict)
+        Files are pruned together because a keyframes block in one file can
+        be used by an animation in another
+        """
+        pruned, keyframes = {}, {}
+        for name, text in stylesheets.items():
+            keyframes[name] = {}
+            pruned[name] = filter_rules(minify_css(text), self.selector_used, keyframes[name])
+        corpus = self.corpus + ''.join(pruned.values())
+        for name in pruned:
+            pruned[name] += ''.join(block for animation, block in keyframes[name].items()
+                                    if references(animation, corpus))
+            if pruned[name]:
+                pruned[name] += '\n'
+        return pruned
+
+    def report(self, stylesheets):
+        """(name, original bytes, minified bytes, pruned bytes) for each stylesheet"""
+        pruned = self.prune(stylesheets)
+        return [
+            (name, len(text.encode('utf-8')), len(minify_css(text).encode('utf-8')),
+             len(pruned[name].encode('utf-8')))
+            for name, text in stylesheets.items()
+        ]
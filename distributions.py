@@ -0,0 +1,134 @@
+"""
+Random sources and weighted distributions for the doodle generator
+Weighted categorical specs are compiled once at import time into alias tables
+(Vose's alias method) so every draw costs one random number and two list
+lookups. CounterRandom gives counter-based streams where the values for any
+(seed, index) pair can be computed directly, without generating the prefix;
+it implements the fnv1a-mulberry32-v1 algorithm clients run from the doodle
+catalog, so a seed yields the same doodles on both sides.
+"""
+
+import bisect
+import random
+
+
+class AliasDistribution:
+    """Immutable weighted categorical distribution with O(1) sampling"""
+
+    __slots__ = ('values', 'weights', 'running', 'prob', 'alias')
+
+    def __init__(self, spec):
+        """
+        Compile a spec into alias tables
+        spec is a mapping of value -> weight or an iterable of (value, weight) pairs
+        """
+        pairs = list(spec.items()) if hasattr(spec, 'items') else list(spec)
+        if not pairs:
+            raise ValueError('distribution needs at least one value')
+        if any(weight < 0 for _, weight in pairs):
+            raise ValueError('distribution weights must be non-negative')
+        total = float(sum(weight for _, weight in pairs))
+        if total <= 0:
+            raise ValueError('distribution weights must sum to a positive number')
+
+        self.values = tuple(value for value, _ in pairs)
+        self.weights = tuple(weight for _, weight in pairs)
+        running, self.running = 0, []
+        for weight in self.weights:
+            running += weight
+            self.running.append(running)
+        self.running = tuple(self.running)
+
+        count = len(pairs)
+        scaled = [weight * count / total for _, weight in pairs]
+        prob = [1.0] * count
+        alias = list(range(count))
+        small = [index for index, weight in enumerate(scaled) if weight < 1.0]
+        large = [index for index, weight in enumerate(scaled) if weight >= 1.0]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            prob[less] = scaled[less]
+            alias[less] = more
+            scaled[more] = scaled[more] + scaled[less] - 1.0
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Whatever remains is 1.0 up to floating point error
+
+        self.prob = tuple(prob)
+        self.alias = tuple(self.values[index] for index in alias)
+
+    def __len__(self):
+        return len(self.values)
+
+    def probabilities(self):
+        """Normalized probability of each value, in spec order"""
+        total = float(sum(self.weights))
+        return {value: weight / total for value, weight in zip(self.values, self.weights)}
+
+    def sample(self, rng):
+        """Draw a single value"""
+        count = len(self.values)
+        x = rng.random() * count
+        index = min(int(x), count - 1)
+        return self.values[index] if x - index < self.prob[index] else self.alias[index]
+
+    def pick(self, u):
+        """
+        Value for a uniform draw u by running weight - the catalog's documented
+        pick (first entry whose running weight exceeds u * total), not the
+        alias method
+        """
+        index = bisect.bisect_right(self.running, u * self.running[-1])
+        return self.values[min(index, len(self.values) - 1)]
+
+    def sample_many(self, rng, k):
+        """Draw k values"""
+        values, alias, prob = self.values, self.alias, self.prob
+        count = len(values)
+        last = count - 1
+        rand = rng.random
+        draws = []
+        append = draws.append
+        for _ in range(k):
+            x = rand() * count
+            index = min(int(x), last)
+            append(values[index] if x - index < prob[index] else alias[index])
+        return draws
+
+
+
+def fnv1a_32(text):
+    """32-bit FNV-1a hash of a string's UTF-8 bytes"""
+    value = 0x811c9dc5
+    for byte in text.encode('utf-8'):
+        value = ((value ^ byte) * 0x01000193) & 0xFFFFFFFF
+    return value
+
+
+class CounterRandom(random.Random):
+    """
+    random.Random whose stream is a pure function of (seed, index)
+    The 32-bit FNV-1a hash of "<seed>:<index>" is the state of a mulberry32
+    generator, so stream N of a seed is O(1) to reach
+    """
+
+    def __init__(self, key, index):
+        self.counter_key = key
+        self.counter_index = index
+        super().__init__()
+
+    @staticmethod
+    def key_for(seed):
+        """Key for a seed - the seed string itself"""
+        return str(seed)
+
+    def seed(self, *args, **kwargs):
+        """Reset to the start of this index's stream (the seed itself is fixed)"""
+        self.state = fnv1a_32(f'{self.counter_key}:{self.counter_index}')
+
+    def random(self):
+        # mulberry32, in unsigned 32-bit arithmetic
+        state = self.state = (self.state + 0x6D2B79F5) & 0xFFFFFFFF
+        t = ((state ^ (state >> 15)) * (state | 1)) & 0xFFFFFFFF
+        t = ((t + ((t ^ (t >> 7)) * (t | 61))) & 0xFFFFFFFF) ^ t
+        return (t ^ (t >> 14)) / 4294967296.0
@@ -0,0 +1,155 @@
+"""
+Incremental static export ("freeze")
+Writes every page, fragment, API document and static file the site serves
+into an output directory, each at the path of its URL and next to its
+precompressed variants, so a plain file server or CDN can take all traffic.
+
+Each output lists the input nodes it is built from (templates, content
+files, static files, the asset manifest, ...). A run fingerprints every
+input once and rebuilds only outputs whose combined input fingerprint
+differs from the one recorded by the previous run; outputs that are no
+longer produced are deleted.
+"""
+
+import hashlib
+import json
+import os
+
+from jinja2 import meta
+
+from compression import compress_variants, is_compressible
+
+
+STATE_NAME = 'freeze-manifest.json'
+VARIANT_SUFFIXES = {'gzip': '.gz', 'br': '.br'}
+
+
+class FreezeOutput:
+    """One file of the export: its path, the inputs it depends on and how to build it"""
+
+    __slots__ = ('path', 'inputs', 'build', 'content_type')
+
+    def __init__(self, path, inputs, build, content_type):
+        self.path = path
+        self.inputs = tuple(sorted(inputs))
+        self.build = build
+        self.content_type = content_type
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def template_dependencies(environment, name):
+    """
+    Every template name reaches through extends/include/import
+    A reference computed at render time could be any template, so it pulls
+    in all of them
+    """
+    seen, pending = set(), [name]
+    while pending:
+        current = pending.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        source = environment.loader.get_source(environment, current)[0]
+        for reference in meta.find_referenced_templates(environment.parse(source)):
+            if reference is None:
+                return set(environment.list_templates())
+            pending.append(reference)
+    return seen
+
+
+def template_fingerprints(environment):
+    """'template:<name>' -> content hash for every template"""
+    fingerprints = {}
+    for name in environment.list_templates():
+        source = environment.loader.get_source(environment, name)[0]
+        fingerprints[f'template:{name}'] = content_hash(source.encode('utf-8'))
+    return fingerprints
+
+
+class Freezer:
+    """
+    Writes outputs into output_dir, skipping those whose inputs are unchanged
+    The fingerprints of the last run are kept in output_dir/freeze-manifest.json
+    together with each output's content type, which a deploy step needs for
+    paths without an extension
+    """
+
+    def __init__(self, output_dir, log=print):
+        self.output_dir = output_dir
+        self.log = log
+
+    def load_state(self):
+        try:
+            with open(os.path.join(self.output_dir, STATE_NAME), encoding='utf-8') as handle:
+                return json.load(handle).get('outputs', {})
+        except (OSError, ValueError):
+            return {}
+
+    def output_fingerprint(self, output, fingerprints):
+        missing = [name for name in output.inputs if name not in fingerprints]
+        if missing:
+            raise KeyError(f'{output.path}: unknown inputs {missing}')
+        return content_hash('\n'.join(f'{name}={fingerprints[name]}' for name in output.inputs).encode('utf-8'))
+
+    def write(self, path, data):
+        """Write a file atomically so a server never sees it half-written"""
+        target = os.path.join(self.output_dir, path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        temporary = f'{target}.tmp'
+        with open(temporary, 'wb') as handle:
+            handle.write(data)
+        os.replace(temporary, target)
+
+    def remove(self, path, encodings=()):
+        """Delete an output and the given variants of it, if present"""
+        for name in [path] + [path + VARIANT_SUFFIXES[encoding] for encoding in encodings]:
+            try:
+                os.remove(os.path.join(self.output_dir, name))
+            except FileNotFoundError:
+                pass
+
+    def run(self, outputs, fingerprints, force=False):
+        """Build the outputs; returns {'written', 'skipped', 'removed'} counts"""
+        previous = self.load_state()
+        state, written, skipped = {}, 0, 0
+        for output in outputs:
+            if output.path in state:
+                raise ValueError(f'duplicate output {output.path}')
+            fingerprint = self.output_fingerprint(output, fingerprints)
+            recorded = previous.get(output.path)
+            if (not force and recorded is not None and recorded['fingerprint'] == fingerprint
+                    and os.path.exists(os.path.join(self.output_dir, output.path))):
+                state[output.path] = recorded
+                skipped += 1
+                continue
+
+            data = output.build()
+            variants = compress_variants(data) if is_compressible(output.content_type) else {}
+            self.write(output.path, data)
+            for encoding, encoded in variants.items():
+                self.write(output.path + VARIANT_SUFFIXES[encoding], encoded)
+            if recorded is not None:
+                for encoding in set(recorded['variants']) - set(variants):
+                    self.remove(output.path + VARIANT_SUFFIXES[encoding])
+            state[output.path] = {
+                'fingerprint': fingerprint,
+                'content_type': output.content_type,
+                'bytes': len(data),
+                'variants': sorted(variants)
+            }
+            written += 1
+            self.log(f'  {output.path} ({len(data)} bytes)')
+
+        removed = 0
+        for path, recorded in previous.items():
+            if path not in state:
+                self.remove(path, recorded['variants'])
+                removed += 1
+                self.log(f'  removed {path}')
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.write(STATE_NAME, json.dumps({'outputs': state}, indent=2, sort_keys=True).encode('utf-8'))
+        return {'written': written, 'skipped': skipped, 'removed': removed}
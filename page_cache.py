@@ -0,0 +1,320 @@
+"""
+Render cache for full pages
+Each entry holds the final response bytes plus precompressed variants and is
+tagged with a fingerprint of everything the page was rendered from (template
+files, content data, static assets). A lookup whose current fingerprint no
+longer matches is treated as a miss, so edits invalidate automatically.
+
+Concurrent misses for the same key are coalesced into a single render
+(single-flight), and a stale entry keeps being served while a background
+thread re-renders it (stale-while-revalidate). A cold miss can instead be
+streamed to the client as it renders and cached once complete.
+"""
+
+import hashlib
+import logging
+import os
+import queue
+import threading
+import time
+
+from compression import compress_variants, negotiate_encoding
+
+
+def directory_fingerprint(root, extensions=None):
+    """Digest of (relative path, mtime, size) for every file under root"""
+    digest = hashlib.sha256()
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if extensions and not filename.endswith(extensions):
+                continue
+            path = os.path.join(dirpath, filename)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            relative = os.path.relpath(path, root).replace(os.sep, '/')
+            digest.update(f'{relative}\0{stat.st_mtime_ns}\0{stat.st_size}\n'.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def file_fingerprint(path):
+    """Digest of a single file's path, mtime and size ('' if it is missing)"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return ''
+    return hashlib.sha256(f'{path}\0{stat.st_mtime_ns}\0{stat.st_size}'.encode('utf-8')).hexdigest()
+
+
+def combine_fingerprints(parts):
+    """Fold several fingerprints into one"""
+    return hashlib.sha256('\n'.join(parts).encode('utf-8')).hexdigest()
+
+
+class CachedPage:
+    """Rendered page bytes with precompressed variants"""
+
+    __slots__ = ('body', 'variants', 'fingerprint', 'mimetype', 'created')
+
+    def __init__(self, body, fingerprint, mimetype='text/html; charset=utf-8'):
+        self.body = body
+        self.variants = compress_variants(body)
+        self.fingerprint = fingerprint
+        self.mimetype = mimetype
+        self.created = time.time()
+
+    def encoded(self, accept_encoding):
+        """(content_encoding, bytes) for an Accept-Encoding header value"""
+        encoding = negotiate_encoding(accept_encoding, self.variants)
+        if encoding is None:
+            return None, self.body
+        return encoding, self.variants[encoding]
+
+
+class RenderFlight:
+    """One in-progress render that other requests for the key can wait on"""
+
+    __slots__ = ('done', 'entry', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.entry = None
+        self.error = None
+
+
+def flush_at(fragments, markers):
+    """
+    Regroup template output into chunks that end at one of the markers
+    (e.g. '</head>', '</section>'), so each chunk is a useful flush
+    """
+    buffered = []
+    for fragment in fragments:
+        # Static template text arrives in large pieces that can span several sections
+        while True:
+            ends = [fragment.find(marker) + len(marker) for marker in markers if marker in fragment]
+            if not ends:
+                break
+            end = min(ends)
+            buffered.append(fragment[:end])
+            yield ''.join(buffered)
+            buffered, fragment = [], fragment[end:]
+        if fragment:
+            buffered.append(fragment)
+    if buffered:
+        yield ''.join(buffered)
+
+
+class PageStream:
+    """
+    Iterator over a page that is being rendered for a streamed response
+    The render runs on its own thread and hands chunks over through a queue,
+    so a slow client never holds up the requests coalesced onto the render;
+    the page is cached as soon as the render completes
+    """
+
+    finished = object()
+
+    def __init__(self, cache, key, fingerprint, stream, flight):
+        self.cache = cache
+        self.key = key
+        self.fingerprint = fingerprint
+        self.stream = stream
+        self.flight = flight
+        self.chunks = queue.Queue()
+        threading.Thread(target=self._render, name=f'page-stream-{key}', daemon=True).start()
+
+    def _render(self):
+        parts = []
+        try:
+            if self.cache.background_context is not None:
+                with self.cache.background_context():
+                    for chunk in self.stream():
+                        parts.append(chunk)
+                        self.chunks.put(chunk)
+            else:
+                for chunk in self.stream():
+                    parts.append(chunk)
+                    self.chunks.put(chunk)
+            self.flight.entry = self.cache.store(self.key, self.fingerprint, ''.join(parts))
+            with self.cache.lock:
+                self.cache.renders += 1
+        except Exception as error:
+            self.flight.error = error
+            self.cache.logger.exception('Streamed render of %s failed', self.key)
+        finally:
+            self.chunks.put(self.finished)
+            self.cache._end_flight(self.key, self.flight)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        chunk = self.chunks.get()
+        if chunk is self.finished:
+            self.chunks.put(chunk)  # keep answering StopIteration
+            if self.flight.error is not None:
+                raise self.flight.error
+            raise StopIteration
+        return chunk
+
+
+class PageCache:
+    """
+    Fingerprint-validated store of rendered pages
+    Fingerprints are recomputed at most once per check_interval per key, so a
+    hit costs a dict lookup rather than a walk over the input files.
+    background_context is a factory for the context manager background
+    re-renders run in (e.g. a Flask test request context).
+    """
+
+    def __init__(self, check_interval=1.0, stale_while_revalidate=True, background_context=None,
+                 clock=time.monotonic):
+        self.check_interval = check_interval
+        self.stale_while_revalidate = stale_while_revalidate
+        self.background_context = background_context
+        self.clock = clock
+        self.entries = {}
+        self.fingerprints = {}
+        self.flights = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.coalesced = 0
+        self.renders = 0
+        self.logger = logging.getLogger(__name__)
+
+    def fingerprint(self, key, compute):
+        """Current fingerprint for key, recomputed when the last one is stale"""
+        now = self.clock()
+        with self.lock:
+            cached = self.fingerprints.get(key)
+            if cached is not None and now - cached[1] < self.check_interval:
+                return cached[0]
+        value = compute()
+        with self.lock:
+            self.fingerprints[key] = (value, now)
+        return value
+
+    def peek(self, key):
+        """Cached entry for key, current or stale, without counting a hit or miss"""
+        with self.lock:
+            return self.entries.get(key)
+
+    def get(self, key, fingerprint):
+        """Cached page for key if it was rendered from the same inputs"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry.fingerprint == fingerprint:
+                self.hits += 1
+                return entry
+            self.misses += 1
+            return None
+
+    def store(self, key, fingerprint, body, mimetype='text/html; charset=utf-8'):
+        """Store rendered bytes and return the new entry"""
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        entry = CachedPage(body, fingerprint, mimetype)
+        with self.lock:
+            self.entries[key] = entry
+        return entry
+
+    def get_or_render(self, key, compute_fingerprint, render):
+        """
+        Return the cached page for key, rendering it when inputs changed
+        A stale entry is returned immediately while one background thread
+        re-renders it; with no entry at all, concurrent callers share one render
+        """
+        fingerprint = self.fingerprint(key, compute_fingerprint)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry.fingerprint == fingerprint:
+                self.hits += 1
+                return entry
+            self.misses += 1
+            flight = self.flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.flights[key] = RenderFlight()
+            if entry is not None and self.stale_while_revalidate:
+                self.stale_hits += 1
+                if leader:
+                    threading.Thread(
+                        target=self._render_flight,
+                        args=(key, fingerprint, render, flight, True),
+                        name=f'page-cache-{key}',
+                        daemon=True
+                    ).start()
+                return entry
+            if not leader:
+                self.coalesced += 1
+
+        if leader:
+            self._render_flight(key, fingerprint, render, flight, False)
+        else:
+            flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.entry
+
+    def get_or_stream(self, key, compute_fingerprint, stream):
+        """
+        (entry, None) when key can be answered from the cache, or (None, chunks)
+        Only a cold miss that nobody else is rendering is streamed: chunks is a
+        PageStream rendering stream(), which caches the page when done. With
+        any entry, fresh or stale, or a render in flight this behaves exactly
+        like get_or_render
+        """
+        fingerprint = self.fingerprint(key, compute_fingerprint)
+        with self.lock:
+            if key not in self.entries and key not in self.flights:
+                self.misses += 1
+                flight = self.flights[key] = RenderFlight()
+                return None, PageStream(self, key, fingerprint, stream, flight)
+        return self.get_or_render(key, compute_fingerprint, lambda: ''.join(stream())), None
+
+    def _render_flight(self, key, fingerprint, render, flight, background):
+        """Render once for everyone waiting on this flight"""
+        try:
+            if background and self.background_context is not None:
+                with self.background_context():
+                    body = render()
+            else:
+                body = render()
+            flight.entry = self.store(key, fingerprint, body)
+            with self.lock:
+                self.renders += 1
+        except Exception as error:
+            flight.error = error
+            if background:
+                self.logger.exception('Background re-render of %s failed; serving stale copy', key)
+        finally:
+            self._end_flight(key, flight)
+
+    def _end_flight(self, key, flight):
+        """Release everyone waiting on a finished flight"""
+        with self.lock:
+            self.flights.pop(key, None)
+        flight.done.set()
+
+    def clear(self):
+        """Drop every entry and fingerprint"""
+        with self.lock:
+            self.entries.clear()
+            self.fingerprints.clear()
+
+    def stats(self):
+        """Hit/miss counters and cached keys"""
+        with self.lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'stale_hits': self.stale_hits,
+                'coalesced': self.coalesced,
+                'renders': self.renders,
+                'in_flight': sorted(self.flights),
+                'keys': sorted(self.entries)
+            }
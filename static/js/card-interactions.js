@@ -16,9 +16,12 @@ class EnhancedCardEffects {
         } else {
             this.setupCardEffects();
         }
+
+        // Sections loaded later as fragments (section-fragments.js)
+        document.addEventListener('fragment:loaded', (e) => this.setupCardEffects(e.detail.section));
     }
 
-    setupCardEffects() {
+    setupCardEffects(root = document) {
         // Card selectors for enhanced effects
         const cardSelectors = [
             '.experience-card',
@@ -36,12 +39,12 @@ class EnhancedCardEffects {
         ];
 
         cardSelectors.forEach(selector => {
-            const cards = document.querySelectorAll(selector);
+            const cards = root.querySelectorAll(selector);
             cards.forEach(card => this.enhanceCard(card));
         });
 
         // Initialize embedded badges handling
-        this.initEmbeddedBadges();
+        this.initEmbeddedBadges(root);
 
         // Initialize testimonial carousel
         setTimeout(() => {
@@ -52,9 +55,9 @@ class EnhancedCardEffects {
         // console.log('✨ Enhanced card effects initialized');
     }
 
-    initEmbeddedBadges() {
+    initEmbeddedBadges(root = document) {
         // Handle embedded badge loading and interactions
-        const embeddedWrappers = document.querySelectorAll('.embedded-badge-wrapper');
+        const embeddedWrappers = root.querySelectorAll('.embedded-badge-wrapper');
         
         embeddedWrappers.forEach(wrapper => {
             // Add loading state
@@ -250,7 +253,8 @@ class EnhancedCardEffects {
         const dots = document.querySelectorAll('.testimonial-dots .dot');
         let currentIndex = 0;
 
-        if (testimonialCards.length === 0) return;
+        if (testimonialCards.length === 0 || this.carouselStarted) return;
+        this.carouselStarted = true;
 
         // Initialize first testimonial as active
         this.showTestimonial(currentIndex, testimonialCards, dots);
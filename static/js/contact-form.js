@@ -1,64 +1,74 @@
 // Contact form functionality
 document.addEventListener('DOMContentLoaded', function() {
-    // Contact form handling
-    const contactForm = document.querySelector('.modern-contact-form');
-    const sendBtn = document.querySelector('.send-message-btn');
+    bindContactSection(document);
+
+    // The contact section may arrive later as a fragment (section-fragments.js)
+    document.addEventListener('fragment:loaded', function(e) {
+        bindContactSection(e.detail.section);
+    });
+
+    function bindContactSection(root) {
+        // Contact form handling
+        const contactForm = root.querySelector('.modern-contact-form');
+        const sendBtn = root.querySelector('.send-message-btn');
     
-    if (contactForm && sendBtn) {
-        contactForm.addEventListener('submit', function(e) {
-            e.preventDefault();
+        if (contactForm && sendBtn && !contactForm.dataset.bound) {
+            contactForm.dataset.bound = 'true';
+            contactForm.addEventListener('submit', function(e) {
+                e.preventDefault();
             
-            // Get form data
-            const formData = new FormData(this);
-            const name = formData.get('name') || '';
-            const email = formData.get('email') || '';
-            const subject = formData.get('subject') || '';
-            const message = formData.get('message') || '';
+                // Get form data
+                const formData = new FormData(this);
+                const name = formData.get('name') || '';
+                const email = formData.get('email') || '';
+                const subject = formData.get('subject') || '';
+                const message = formData.get('message') || '';
             
-            // Validate required fields
-            if (!name.trim() || !email.trim() || !message.trim()) {
-                showNotification('Please fill in all required fields.', 'error');
-                return;
-            }
+                // Validate required fields
+                if (!name.trim() || !email.trim() || !message.trim()) {
+                    showNotification('Please fill in all required fields.', 'error');
+                    return;
+                }
             
-            // Validate email format
-            const emailRegex = /^[^\s@]+@[^\s@]+\.[^\s@]+$/;
-            if (!emailRegex.test(email)) {
-                showNotification('Please enter a valid email address.', 'error');
-                return;
-            }
+                // Validate email format
+                const emailRegex = /^[^\s@]+@[^\s@]+\.[^\s@]+$/;
+                if (!emailRegex.test(email)) {
+                    showNotification('Please enter a valid email address.', 'error');
+                    return;
+                }
             
-            // Update button state
-            const originalText = sendBtn.innerHTML;
-            sendBtn.innerHTML = '<i class="fas fa-spinner fa-spin"></i> Sending...';
-            sendBtn.disabled = true;
+                // Update button state
+                const originalText = sendBtn.innerHTML;
+                sendBtn.innerHTML = '<i class="fas fa-spinner fa-spin"></i> Sending...';
+                sendBtn.disabled = true;
             
-            // Create mailto URL
-            const mailtoUrl = createMailtoUrl(email, name, subject, message);
+                // Create mailto URL
+                const mailtoUrl = createMailtoUrl(email, name, subject, message);
             
-            // Show success message and open email client
-            setTimeout(() => {
-                window.location.href = mailtoUrl;
-                showNotification('Email client opened! Please send the email to complete your message.', 'success');
+                // Show success message and open email client
+                setTimeout(() => {
+                    window.location.href = mailtoUrl;
+                    showNotification('Email client opened! Please send the email to complete your message.', 'success');
                 
-                // Reset form
-                this.reset();
+                    // Reset form
+                    this.reset();
                 
-                // Reset button
-                sendBtn.innerHTML = originalText;
-                sendBtn.disabled = false;
-            }, 1000);
-        });
-    }
+                    // Reset button
+                    sendBtn.innerHTML = originalText;
+                    sendBtn.disabled = false;
+                }, 1000);
+            });
+        }
 
-    // Handle "Get My Pricing" button
-    const pricingBtn = document.querySelector('.hire-btn');
-    if (pricingBtn) {
-        pricingBtn.addEventListener('click', function(e) {
-            e.preventDefault();
+        // Handle "Get My Pricing" button
+        const pricingBtn = root.querySelector('.hire-btn');
+        if (pricingBtn && !pricingBtn.dataset.bound) {
+            pricingBtn.dataset.bound = 'true';
+            pricingBtn.addEventListener('click', function(e) {
+                e.preventDefault();
             
-            const subject = 'Project Inquiry - Request for Pricing';
-            const body = `Hello,
+                const subject = 'Project Inquiry - Request for Pricing';
+                const body = `Hello,
 
 I'm interested in your services and would like to discuss a potential project.
 
@@ -75,11 +85,12 @@ Project details:
 Best regards,
 [Your name]`;
             
-            const mailtoUrl = `mailto:${getContactEmail()}?subject=${encodeURIComponent(subject)}&body=${encodeURIComponent(body)}`;
-            window.location.href = mailtoUrl;
+                const mailtoUrl = `mailto:${getContactEmail()}?subject=${encodeURIComponent(subject)}&body=${encodeURIComponent(body)}`;
+                window.location.href = mailtoUrl;
             
-            showNotification('Email template opened! Please complete and send.', 'info');
-        });
+                showNotification('Email template opened! Please complete and send.', 'info');
+            });
+        }
     }
 
     // Server-side form submission fallback
@@ -95,6 +106,7 @@ Best regards,
         .then(data => {
             if (data.success) {
                 showNotification(data.message || 'Message sent successfully!', 'success');
+                const contactForm = document.querySelector('.modern-contact-form');
                 if (contactForm) contactForm.reset();
             } else {
                 throw new Error(data.message || 'Failed to send message');
@@ -62,18 +62,24 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }, observerOptions);
     
-    // Initialize after a delay and also on window load
-    setTimeout(() => {
-        // Find all stat numbers and observe them
-        const statNumbers = document.querySelectorAll('.stat-number[data-target]');
+    // Observe the stat numbers under root that are not observed yet
+    function observeCounters(root = document) {
+        const statNumbers = root.querySelectorAll('.stat-number[data-target]');
         statNumbers.forEach(element => {
+            if (originalValues.has(element)) return;
             // Store original value
             originalValues.set(element, element.textContent);
             counterObserver.observe(element);
         });
         
         console.log(`🔢 Observing ${statNumbers.length} counter elements`);
-    }, 400);
+    }
+    
+    // Initialize after a delay and also on window load
+    setTimeout(() => observeCounters(), 400);
+    
+    // Sections loaded later as fragments (section-fragments.js)
+    document.addEventListener('fragment:loaded', (e) => observeCounters(e.detail.section));
     
     // Also initialize on window load
     window.addEventListener('load', () => {
@@ -5,9 +5,170 @@
 let faActiveDoodles = [];
 let faDoodleCounter = 0;
 let faMaxDoodles = window.innerWidth <= 768 ? 15 : 25; // Responsive limit
+const faResponsiveMaxDoodles = faMaxDoodles;
+
+// Stable per-tab client id so the server can adapt the doodle budget to this client
+const faClientId = (function() {
+    try {
+        let id = sessionStorage.getItem('doodle-client-id');
+        if (!id) {
+            id = Math.random().toString(36).slice(2, 12);
+            sessionStorage.setItem('doodle-client-id', id);
+        }
+        return id;
+    } catch (error) {
+        return Math.random().toString(36).slice(2, 12);
+    }
+})();
+
+// Apply a server-computed doodle budget without exceeding the responsive limit
+function applyDoodleConfig(config) {
+    if (!config) return;
+    if (config.max_doodles) {
+        faMaxDoodles = Math.min(faResponsiveMaxDoodles, config.max_doodles);
+    }
+    if (config.performance_threshold) {
+        faPerformanceThreshold = config.performance_threshold;
+    }
+}
+
+// Doodles pushed by the server stream, consumed before falling back to polling
+let faDoodleQueue = [];
+let faDoodleStream = null;
+const faDoodleQueueLimit = 20;
+
+// Local generation state - the server hands out a seed once and the catalog
+// (icon/color/style tables with weights) is cached immutably by the browser
+let faDoodleCatalog = null;
+let faDoodleSeed = null;
+let faDoodleIndex = 0;
+
+// 32-bit FNV-1a over the UTF-8 bytes of text
+function fnv1a32(text) {
+    let hash = 0x811c9dc5;
+    for (const byte of new TextEncoder().encode(text)) {
+        hash ^= byte;
+        hash = Math.imul(hash, 0x01000193) >>> 0;
+    }
+    return hash;
+}
+
+// mulberry32 generator returning floats in [0, 1)
+function mulberry32(state) {
+    return function() {
+        state = (state + 0x6D2B79F5) | 0;
+        let t = Math.imul(state ^ (state >>> 15), 1 | state);
+        t = (t + Math.imul(t ^ (t >>> 7), 61 | t)) ^ t;
+        return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+    };
+}
+
+// Pick from catalog entries using their precomputed running weights
+function pickWeighted(entries, u) {
+    const target = u * entries.totalWeight;
+    for (const entry of entries) {
+        if (entry.runningWeight > target) return entry;
+    }
+    return entries[entries.length - 1];
+}
+
+function prepareWeighted(entries) {
+    let running = 0;
+    for (const entry of entries) {
+        running += entry.weight;
+        entry.runningWeight = running;
+    }
+    entries.totalWeight = running;
+    return entries;
+}
+
+// Generate doodle `index` of `seed` exactly as described by catalog.algorithm
+function generateLocalDoodle(catalog, seed, index) {
+    const next = mulberry32(fnv1a32(`${seed}:${index}`));
+    const uniform = list => list[Math.floor(next() * list.length)];
+    const range = ([low, high]) => low + (high - low) * next();
+
+    const icon = pickWeighted(catalog.icons, next());
+    return {
+        icon: icon.name,
+        prefix: icon.prefix,
+        color: pickWeighted(catalog.colors, next()).value,
+        size: pickWeighted(catalog.sizes, next()).value,
+        lifetime: pickWeighted(catalog.lifetimes, next()).value,
+        style: uniform(catalog.styles),
+        pattern: uniform(catalog.patterns),
+        hover_effect: uniform(catalog.hover_effects),
+        section: Math.floor(next() * catalog.sections),
+        opacity: range(catalog.ranges.opacity),
+        speed: range(catalog.ranges.speed)
+    };
+}
+
+function faDoodleClientParam() {
+    return encodeURIComponent(faClientId);
+}
+
+// Fetch a seed and the catalog so doodles can be generated without further requests
+async function loadDoodleCatalog() {
+    try {
+        const seedResponse = await fetch(`/api/doodles/seed?client=${faDoodleClientParam()}`);
+        if (!seedResponse.ok) return false;
+        const session = await seedResponse.json();
+        if (session.algorithm !== 'fnv1a-mulberry32-v1') return false;
+
+        const catalogResponse = await fetch(session.catalog);
+        if (!catalogResponse.ok) return false;
+        const catalog = await catalogResponse.json();
+        ['icons', 'colors', 'sizes', 'lifetimes'].forEach(name => prepareWeighted(catalog[name]));
+
+        applyDoodleConfig(session.config);
+        faDoodleCatalog = catalog;
+        faDoodleSeed = session.seed;
+        faDoodleIndex = 0;
+        return true;
+    } catch (error) {
+        return false;
+    }
+}
+
+// Open a long-lived Server-Sent Events feed instead of one request per doodle
+function openDoodleStream(initialCount) {
+    if (faDoodleStream || typeof window.EventSource === 'undefined') return;
+
+    faDoodleStream = new EventSource(`/api/doodles/stream?initial=${initialCount}&interval=2000&client=${faDoodleClientParam()}`);
+    faDoodleStream.addEventListener('doodle', function(event) {
+        if (faDoodleQueue.length >= faDoodleQueueLimit) return;
+        try {
+            faDoodleQueue.push(JSON.parse(event.data));
+        } catch (error) {
+            // Ignore malformed events
+        }
+    });
+    faDoodleStream.addEventListener('config', function(event) {
+        try {
+            applyDoodleConfig(JSON.parse(event.data));
+        } catch (error) {
+            // Keep local limits
+        }
+    });
+}
 
 // Function to fetch doodle data from the server API (Enhanced version)
 async function fetchDoodleData(count = 10) {
+    // Generate locally once the catalog and seed are loaded
+    if (faDoodleCatalog) {
+        const doodles = [];
+        for (let i = 0; i < count; i++) {
+            doodles.push(generateLocalDoodle(faDoodleCatalog, faDoodleSeed, faDoodleIndex++));
+        }
+        return { doodles, config: null, enhanced: false };
+    }
+
+    // Serve from the streamed queue when it can satisfy the request
+    if (faDoodleQueue.length >= count) {
+        return { doodles: faDoodleQueue.splice(0, count), config: null, enhanced: false };
+    }
+
     try {
         // Use the new API client if available
         if (window.portfolioAPI) {
@@ -22,11 +183,12 @@ async function fetchDoodleData(count = 10) {
         }
 
         // Fallback to original API
-        const response = await fetch(`/api/doodles?count=${count}`);
+        const response = await fetch(`/api/doodles?count=${count}&client=${faDoodleClientParam()}`);
         if (!response.ok) {
             throw new Error(`API returned status ${response.status}`);
         }
         const data = await response.json();
+        applyDoodleConfig(data.config);
         return { 
             doodles: data.doodles || [], 
             config: data.config || null,
@@ -43,37 +205,10 @@ async function fetchDoodleData(count = 10) {
 async function createRandomFontAwesomeDoodle(serverData = null) {
     // Production mode - minimal logging
     
-    // Python, Data Science & Programming focused icons
+    // Offline fallback only - the full icon table comes from /api/doodles/catalog
     const pythonDataScienceIcons = [
-        // Python & Core Programming
-        'fab fa-python', 'fab fa-python', 'fab fa-python', // Multiple Python icons for higher frequency
-        'fas fa-code', 'fas fa-terminal', 'fas fa-laptop-code', 'fas fa-file-code',
-        
-        // Data Science & Analytics  
-        'fas fa-chart-line', 'fas fa-chart-bar', 'fas fa-chart-pie', 'fas fa-chart-area',
-        'fas fa-database', 'fas fa-table', 'fas fa-calculator', 'fas fa-analytics',
-        
-        // Development Tools & Version Control
-        'fab fa-github', 'fab fa-git-alt', 'fas fa-code-branch', 'fas fa-project-diagram',
-        
-        // Machine Learning & AI symbols
-        'fas fa-brain', 'fas fa-robot', 'fas fa-network-wired', 'fas fa-sitemap',
-        'fas fa-cogs', 'fas fa-microchip', 'fas fa-memory',
-        
-        // Cloud & Infrastructure for Data Science
-        'fab fa-aws', 'fas fa-cloud', 'fas fa-server', 'fas fa-hdd',
-        'fab fa-docker', 'fas fa-cubes',
-        
-        // Jupyter Notebooks & Development
-        'fas fa-file-alt', 'fas fa-sticky-note', 'fas fa-edit', 'fas fa-keyboard',
-        
-        // Mathematical & Scientific symbols
-        'fas fa-square-root-alt', 'fas fa-infinity', 'fas fa-function', 'fas fa-equals',
-        'fas fa-percentage', 'fas fa-plus', 'fas fa-minus', 'fas fa-times',
-        
-        // Data Visualization
-        'fas fa-eye', 'fas fa-search', 'fas fa-filter', 'fas fa-sort',
-        'fas fa-layer-group', 'fas fa-th', 'fas fa-stream'
+        'fab fa-python', 'fas fa-code', 'fas fa-chart-line', 'fas fa-database',
+        'fas fa-brain', 'fab fa-github', 'fas fa-cloud', 'fas fa-terminal'
     ];
     
     // Create the doodle element
@@ -263,7 +398,7 @@ function manageDoodleLifecycle() {
     });
     
     // Create new doodles only if we're significantly below target
-    const targetCount = window.innerWidth <= 768 ? 6 : 10;
+    const targetCount = Math.min(window.innerWidth <= 768 ? 6 : 10, faMaxDoodles);
     const currentCount = faActiveDoodles.length;
     
     if (currentCount < targetCount * 0.8) { // Only create when below 80% of target
@@ -278,7 +413,7 @@ function manageDoodleLifecycle() {
 }
 
 // Initialize the doodle system
-function initFontAwesomeDoodles() {
+async function initFontAwesomeDoodles() {
     // Production mode - minimal logging
     
     try {
@@ -298,6 +433,12 @@ function initFontAwesomeDoodles() {
         
         // Create initial batch of doodles - distributed across viewport
         const initialCount = window.innerWidth <= 768 ? 8 : 12;
+        
+        // Generate locally from the catalog; fall back to the streamed feed so
+        // the staggered batch below does not poll
+        if (!(await loadDoodleCatalog())) {
+            openDoodleStream(initialCount);
+        }
         // console.log(`Creating ${initialCount} initial doodles`);
         
         // Create doodles with staggered timing for smooth appearance
@@ -311,6 +452,9 @@ function initFontAwesomeDoodles() {
         // Start lifecycle management with less aggressive timing
         setInterval(manageDoodleLifecycle, 3000); // Every 3 seconds instead of 1
         
+        // Periodically report frame rate and doodle count
+        startDoodleStatusReports();
+        
         // console.log('✅ FontAwesome doodle system initialized with ' + initialCount + ' doodles');
     } catch (error) {
         console.error('❌ Error initializing doodle system:', error);
@@ -345,6 +489,72 @@ window.addEventListener('scroll', function() {
     }, 500); // Increased throttle time
 });
 
+// Performance reporting - frame rate is sampled with requestAnimationFrame and
+// posted with the active doodle count so the server can aggregate it
+let faFrameCount = 0;
+let faFrameWindowStart = performance.now();
+let faFrameWindowHidden = false; // the tab was hidden at some point in this window
+let faPerformanceThreshold = 30;
+const faStatusInterval = 30000;
+
+function countDoodleFrame() {
+    faFrameCount++;
+    requestAnimationFrame(countDoodleFrame);
+}
+
+function resetDoodleFrameWindow() {
+    faFrameCount = 0;
+    faFrameWindowStart = performance.now();
+    faFrameWindowHidden = document.hidden;
+}
+
+function reportDoodleStatus() {
+    // Frames are not drawn while the tab is hidden, so a window that covers
+    // hidden time would report a bogus low frame rate
+    if (document.hidden || faFrameWindowHidden) {
+        resetDoodleFrameWindow();
+        return;
+    }
+
+    const now = performance.now();
+    const fps = faFrameCount * 1000 / Math.max(now - faFrameWindowStart, 1);
+    resetDoodleFrameWindow();
+
+    const issues = [];
+    if (fps < faPerformanceThreshold) issues.push('low-fps');
+    if (faActiveDoodles.length >= faMaxDoodles) issues.push('doodle-limit');
+
+    fetch('/api/doodles/status', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({
+            client: faClientId,
+            count: faActiveDoodles.length,
+            fps: Math.round(fps * 10) / 10,
+            mobile: window.innerWidth <= 768,
+            issues
+        })
+    }).then(response => response.ok ? response.json() : null).then(data => {
+        // The server answers with this client's updated budget
+        if (data) applyDoodleConfig(data.config);
+    }).catch(() => {
+        // Telemetry is best effort
+    });
+}
+
+function startDoodleStatusReports() {
+    requestAnimationFrame(countDoodleFrame);
+    setInterval(reportDoodleStatus, faStatusInterval);
+    // Start a fresh window when the tab is shown again
+    document.addEventListener('visibilitychange', () => {
+        if (document.hidden) {
+            faFrameWindowHidden = true;
+        } else {
+            resetDoodleFrameWindow();
+        }
+    });
+}
+
 // Helper functions
 function getRandomColor() {
     const colors = [
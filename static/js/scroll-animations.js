@@ -48,7 +48,8 @@ document.addEventListener('DOMContentLoaded', function() {
     // console.log('✅ SCROLL ANIMATION CSS INJECTED');
     
     // Step 2: Find all elements (including auto-added ones and embedded badges)
-    const observeElements = () => {
+    // in root, which is the whole page or a section loaded as a fragment
+    const observeElements = (root = document) => {
         const animationSelectors = [
             '.scroll-animate', 
             '.scroll-animate-up', 
@@ -66,12 +67,15 @@ document.addEventListener('DOMContentLoaded', function() {
         
         let allElements = [];
         animationSelectors.forEach(selector => {
-            const elements = document.querySelectorAll(selector);
+            if (root !== document && root.matches(selector)) {
+                allElements.push(root);
+            }
+            const elements = root.querySelectorAll(selector);
             allElements = [...allElements, ...elements];
         });
         
         // Add embedded badge wrappers to scroll animations
-        const embeddedWrappers = document.querySelectorAll('.embedded-badge-wrapper');
+        const embeddedWrappers = root.querySelectorAll('.embedded-badge-wrapper');
         embeddedWrappers.forEach(wrapper => {
             if (!wrapper.classList.contains('scroll-animate-up')) {
                 wrapper.classList.add('scroll-animate-up');
@@ -79,7 +83,7 @@ document.addEventListener('DOMContentLoaded', function() {
         });
         
         // Add embedded categories to scroll animations  
-        const embeddedCategories = document.querySelectorAll('.embedded-category');
+        const embeddedCategories = root.querySelectorAll('.embedded-category');
         embeddedCategories.forEach(category => {
             if (!category.classList.contains('scroll-animate-up')) {
                 category.classList.add('scroll-animate-up');
@@ -87,7 +91,7 @@ document.addEventListener('DOMContentLoaded', function() {
         });
         
         // Add embedded badges section to scroll animations
-        const embeddedSection = document.querySelector('.embedded-badges-section');
+        const embeddedSection = root.querySelector('.embedded-badges-section');
         if (embeddedSection && !embeddedSection.classList.contains('scroll-animate-up')) {
             embeddedSection.classList.add('scroll-animate-up');
         }
@@ -166,9 +170,9 @@ document.addEventListener('DOMContentLoaded', function() {
     // console.log(`🎬 OBSERVING ${elements.length} ELEMENTS (including auto-animated)`);
     // console.log('🎬 BIDIRECTIONAL SCROLL ANIMATIONS INITIALIZED!');
     
-    // Optional: Re-scan for new elements periodically
-    setInterval(() => {
-        const newElements = observeElements();
+    // Observe elements that are not observed yet
+    const observeNewElements = (root = document) => {
+        const newElements = observeElements(root);
         newElements.forEach(element => {
             if (!observedElements.has(element)) {
                 // New element found, add animation and observe
@@ -181,5 +185,12 @@ document.addEventListener('DOMContentLoaded', function() {
                 // console.log('🆕 NEW ELEMENT DETECTED:', element.tagName, element.className);
             }
         });
-    }, 2000);
+    };
+    
+    // Sections loaded later as fragments (section-fragments.js) are observed
+    // right away, so a nav click never lands on still-hidden elements
+    document.addEventListener('fragment:loaded', (e) => observeNewElements(e.detail.section));
+    
+    // Optional: Re-scan for new elements periodically
+    setInterval(() => observeNewElements(), 2000);
 });
@@ -0,0 +1,86 @@
+// Lazy home page sections
+// Each below-the-fold section starts as a placeholder with data-fragment and is
+// replaced by /fragments/<section> as it approaches the viewport. Other scripts
+// set up the new markup by listening for the 'fragment:loaded' event.
+document.addEventListener('DOMContentLoaded', function() {
+    const placeholders = Array.from(document.querySelectorAll('section[data-fragment]'));
+    if (placeholders.length === 0) return;
+
+    const pending = new Map();
+
+    function loadFragment(placeholder) {
+        if (pending.has(placeholder)) return pending.get(placeholder);
+
+        const request = fetch(placeholder.dataset.fragment, { credentials: 'same-origin' })
+            .then(response => {
+                if (!response.ok) throw new Error(`HTTP ${response.status}`);
+                return response.text();
+            })
+            .then(html => {
+                const template = document.createElement('template');
+                template.innerHTML = html;
+                const section = template.content.querySelector('section');
+                placeholder.replaceWith(template.content);
+                if (section) {
+                    if (section.querySelector('[data-share-badge-id]')) reloadCredlyEmbeds();
+                    document.dispatchEvent(new CustomEvent('fragment:loaded', { detail: { section } }));
+                }
+                return section;
+            })
+            .catch(error => {
+                console.warn(`⚠️ Failed to load section ${placeholder.id}:`, error);
+                pending.delete(placeholder);
+                return null;
+            });
+        pending.set(placeholder, request);
+        return request;
+    }
+
+    // Credly's embed script only converts badges present when it runs
+    function reloadCredlyEmbeds() {
+        const script = document.createElement('script');
+        script.async = true;
+        script.src = '//cdn.credly.com/assets/utilities/embed.js';
+        document.body.appendChild(script);
+    }
+
+    // Load everything up to a section so the page above it does not shift while scrolling there
+    function loadThrough(id) {
+        const index = placeholders.findIndex(placeholder => placeholder.id === id);
+        if (index === -1) return Promise.resolve();
+        return Promise.all(placeholders.slice(0, index + 1).map(loadFragment));
+    }
+
+    if ('IntersectionObserver' in window) {
+        const observer = new IntersectionObserver(entries => {
+            entries.forEach(entry => {
+                if (!entry.isIntersecting) return;
+                observer.unobserve(entry.target);
+                loadFragment(entry.target);
+            });
+        }, { rootMargin: '600px 0px' });
+        placeholders.forEach(placeholder => observer.observe(placeholder));
+    } else {
+        placeholders.forEach(loadFragment);
+    }
+
+    // In-page links (navbar, hero buttons) jump to sections that may not be loaded yet
+    document.addEventListener('click', function(e) {
+        const link = e.target.closest('a[href^="#"]');
+        if (!link) return;
+        const id = link.getAttribute('href').slice(1);
+        if (!placeholders.some(placeholder => placeholder.id === id && placeholder.isConnected)) return;
+        loadThrough(id).then(() => {
+            const target = document.getElementById(id);
+            if (target) target.scrollIntoView({ behavior: 'smooth' });
+        });
+    });
+
+    if (location.hash) {
+        const id = decodeURIComponent(location.hash.slice(1));
+        loadThrough(id).then(() => {
+            const target = document.getElementById(id);
+            if (target) target.scrollIntoView();
+        });
+    }
+});
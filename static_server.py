@@ -0,0 +1,247 @@
+"""
+In-memory static file server
+Every file under static/ is loaded once into a table together with its
+precompressed variants, size, mtime and ETag, and a WSGI middleware answers
+static requests from that table before Flask routing runs - no stat, open or
+read per request. Files too large to keep in memory are sent from disk
+through the server's wsgi.file_wrapper, which gunicorn and most production
+servers implement with os.sendfile. Single byte ranges are served from the
+identity encoding.
+"""
+
+import hashlib
+import mimetypes
+import os
+import threading
+import time
+
+from werkzeug.http import http_date, parse_date, parse_etags, parse_if_range_header, parse_range_header, quote_etag
+from werkzeug.utils import get_content_type
+
+from compression import COMPRESSIBLE_EXTENSIONS, compress_variants, negotiate_encoding
+from page_cache import directory_fingerprint
+
+
+# Larger files stay on disk and are sent with the server's file wrapper
+MEMORY_MAX_SIZE = 256 * 1024
+BLOCK_SIZE = 64 * 1024
+
+
+class StaticFile:
+    """One static file: its bytes (None if kept on disk), variants and validators"""
+
+    __slots__ = ('path', 'size', 'mtime_ns', 'last_modified', 'etag', 'content_type', 'body', 'variants')
+
+    def __init__(self, path, size, mtime_ns, etag, content_type, body, variants):
+        self.path = path
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.last_modified = http_date(mtime_ns // 1_000_000_000)
+        self.etag = etag
+        self.content_type = content_type
+        self.body = body
+        self.variants = variants
+
+
+def load_static_file(path, filename, stat, memory_max_size=MEMORY_MAX_SIZE):
+    """StaticFile for a path, compressing text files once up front"""
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        if stat.st_size <= memory_max_size:
+            body = handle.read()
+            digest.update(body)
+        else:
+            body = None
+            for chunk in iter(lambda: handle.read(BLOCK_SIZE), b''):
+                digest.update(chunk)
+    variants = compress_variants(body) if body is not None and filename.endswith(COMPRESSIBLE_EXTENSIONS) else {}
+    return StaticFile(path, stat.st_size, stat.st_mtime_ns, digest.hexdigest()[:32],
+                      get_content_type(mimetype, 'utf-8'), body, variants)
+
+
+class StaticTable:
+    """
+    Every file under root by relative name
+    The directory is re-fingerprinted at most once per check_interval and only
+    files whose mtime or size changed are reloaded
+    """
+
+    def __init__(self, root, check_interval=1.0, clock=time.monotonic, memory_max_size=MEMORY_MAX_SIZE):
+        self.root = root
+        self.check_interval = check_interval
+        self.clock = clock
+        self.memory_max_size = memory_max_size
+        self.lock = threading.Lock()
+        self.files = {}
+        self.directory_fingerprint = None
+        self.checked = None
+        self.refresh(force=True)
+
+    def refresh(self, force=False):
+        """Reload changed files if the static directory changed"""
+        now = self.clock()
+        if not force and self.checked is not None and now - self.checked < self.check_interval:
+            return
+        fingerprint = directory_fingerprint(self.root)
+        with self.lock:
+            self.checked = now
+            if not force and fingerprint == self.directory_fingerprint:
+                return
+            previous = self.files
+
+        files = {}
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                path = os.path.join(dirpath, filename)
+                relative = os.path.relpath(path, self.root).replace(os.sep, '/')
+                try:
+                    stat = os.stat(path)
+                    cached = previous.get(relative)
+                    if cached is not None and cached.mtime_ns == stat.st_mtime_ns and cached.size == stat.st_size:
+                        files[relative] = cached
+                    else:
+                        files[relative] = load_static_file(path, relative, stat, self.memory_max_size)
+                except OSError:
+                    continue
+
+        with self.lock:
+            self.files = files
+            self.directory_fingerprint = fingerprint
+
+    def current(self):
+        """
+        Every StaticFile by relative name, after picking up changes
+        The dict is replaced, never mutated, when files change
+        """
+        self.refresh()
+        return self.files
+
+    def get(self, filename):
+        """StaticFile for a relative name, or None"""
+        self.refresh()
+        return self.files.get(filename)
+
+    def stats(self):
+        """File count and bytes held in memory"""
+        with self.lock:
+            files = list(self.files.values())
+        return {
+            'files': len(files),
+            'in_memory': sum(1 for entry in files if entry.body is not None),
+            'bytes': sum(len(entry.body) + sum(map(len, entry.variants.values()))
+                         for entry in files if entry.body is not None)
+        }
+
+
+def read_range(path, start, length):
+    """Yield length bytes of a file from start"""
+    with open(path, 'rb') as handle:
+        handle.seek(start)
+        while length > 0:
+            chunk = handle.read(min(BLOCK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+class StaticMiddleware:
+    """
+    WSGI middleware serving GET/HEAD under url_path from a StaticTable
+    resolve maps a requested name to (filename, is_current_hash) and max_age
+    gives the Cache-Control max-age of plain names; anything not in the
+    table falls through to the wrapped app
+    """
+
+    def __init__(self, app, table, url_path, resolve=None, max_age=None, immutable_max_age=31536000):
+        self.app = app
+        self.table = table
+        self.prefix = url_path.rstrip('/') + '/'
+        self.resolve = resolve
+        self.max_age = max_age
+        self.immutable_max_age = immutable_max_age
+
+    def __call__(self, environ, start_response):
+        path = environ.get('PATH_INFO', '')
+        if environ['REQUEST_METHOD'] not in ('GET', 'HEAD') or not path.startswith(self.prefix):
+            return self.app(environ, start_response)
+        requested = path[len(self.prefix):]
+        filename, immutable = self.resolve(requested) if self.resolve else (requested, False)
+        entry = self.table.get(filename)
+        if entry is None:
+            return self.app(environ, start_response)
+
+        # Ranges are served from the identity bytes
+        encoding = None
+        if entry.variants and 'HTTP_RANGE' not in environ:
+            encoding = negotiate_encoding(environ.get('HTTP_ACCEPT_ENCODING'), entry.variants)
+        etag = entry.etag if encoding is None else f'{entry.etag}-{encoding}'
+
+        headers = [('ETag', quote_etag(etag)), ('Last-Modified', entry.last_modified),
+                   ('Cache-Control', self.cache_control(filename, requested, immutable))]
+        if entry.variants:
+            headers.append(('Vary', 'Accept-Encoding'))
+        if encoding is None:
+            headers.append(('Accept-Ranges', 'bytes'))
+
+        if self.not_modified(environ, etag, entry):
+            start_response('304 Not Modified', headers)
+            return []
+
+        status, start, length = '200 OK', 0, entry.size
+        if encoding is not None:
+            headers.append(('Content-Encoding', encoding))
+            length = len(entry.variants[encoding])
+        elif 'HTTP_RANGE' in environ and self.range_applies(environ, entry):
+            byte_range = parse_range_header(environ['HTTP_RANGE'])
+            bounds = byte_range.range_for_length(entry.size) if byte_range is not None else None
+            if byte_range is not None and len(byte_range.ranges) == 1 and bounds is None:
+                headers.append(('Content-Range', f'bytes */{entry.size}'))
+                start_response('416 Range Not Satisfiable', headers + [('Content-Length', '0')])
+                return []
+            if bounds is not None:
+                status, start, length = '206 Partial Content', bounds[0], bounds[1] - bounds[0]
+                headers.append(('Content-Range', f'bytes {bounds[0]}-{bounds[1] - 1}/{entry.size}'))
+
+        headers += [('Content-Type', entry.content_type), ('Content-Length', str(length))]
+        start_response(status, headers)
+        if environ['REQUEST_METHOD'] == 'HEAD':
+            return []
+        if encoding is not None:
+            return [entry.variants[encoding]]
+        if entry.body is not None:
+            return [entry.body[start:start + length]]
+        file_wrapper = environ.get('wsgi.file_wrapper')
+        if file_wrapper is not None and length == entry.size:
+            return file_wrapper(open(entry.path, 'rb'), BLOCK_SIZE)
+        return read_range(entry.path, start, length)
+
+    def cache_control(self, filename, requested, immutable):
+        if immutable:
+            return f'public, max-age={self.immutable_max_age}, immutable'
+        if filename != requested:
+            return 'no-cache'  # outdated hash - serve the current file but make clients revalidate
+        max_age = self.max_age(filename) if self.max_age is not None else None
+        return f'public, max-age={max_age}' if max_age else 'no-cache'
+
+    @staticmethod
+    def not_modified(environ, etag, entry):
+        if 'HTTP_IF_NONE_MATCH' in environ:
+            tags = parse_etags(environ['HTTP_IF_NONE_MATCH'])
+            return tags.star_tag or tags.contains_weak(etag)
+        since = parse_date(environ.get('HTTP_IF_MODIFIED_SINCE'))
+        return since is not None and entry.mtime_ns // 1_000_000_000 <= since.timestamp()
+
+    @staticmethod
+    def range_applies(environ, entry):
+        """False if If-Range names a different version of the file"""
+        if 'HTTP_IF_RANGE' not in environ:
+            return True
+        if_range = parse_if_range_header(environ['HTTP_IF_RANGE'])
+        if if_range.etag is not None:
+            return if_range.etag == entry.etag
+        if if_range.date is not None:
+            return int(if_range.date.timestamp()) == entry.mtime_ns // 1_000_000_000
+        return False
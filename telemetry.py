@@ -0,0 +1,241 @@
+"""
+In-memory aggregation of client doodle telemetry
+Reports are folded into a fixed ring of time slots, each holding mergeable
+quantile sketches and a bounded issue counter, so memory stays constant no
+matter how many clients report. Rollups merge the slots inside a window.
+Per-client state for adaptive budgets lives in a bounded LRU table.
+"""
+
+import collections
+import math
+import threading
+import time
+
+
+class QuantileSketch:
+    """
+    Mergeable log-bucketed quantile sketch (DDSketch style)
+    Quantiles are accurate to `relative_accuracy`; the bucket count is capped
+    by collapsing the lowest buckets together
+    """
+
+    __slots__ = ('gamma', 'log_gamma', 'max_buckets', 'buckets', 'zero_count', 'count', 'total', 'min', 'max')
+
+    def __init__(self, relative_accuracy=0.02, max_buckets=256):
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.max_buckets = max_buckets
+        self.buckets = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value):
+        """Record one non-negative observation"""
+        value = float(value)
+        if value < 0 or math.isnan(value) or math.isinf(value):
+            return
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if value == 0:
+            self.zero_count += 1
+            return
+        key = math.ceil(math.log(value) / self.log_gamma)
+        self.buckets[key] = self.buckets.get(key, 0) + 1
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+
+    def _collapse(self):
+        keys = sorted(self.buckets)
+        overflow = len(keys) - self.max_buckets
+        target = keys[overflow]
+        for key in keys[:overflow]:
+            self.buckets[target] += self.buckets.pop(key)
+
+    def merge(self, other):
+        """Fold another sketch with the same accuracy into this one"""
+        if other.count == 0:
+            return
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q):
+        """Approximate q-quantile, or None when empty"""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return 0.0
+        seen = self.zero_count
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                value = 2 * self.gamma ** key / (self.gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def summary(self, quantiles=(0.5, 0.9, 0.99)):
+        """Count, mean, min/max and selected quantiles"""
+        if self.count == 0:
+            return {'count': 0}
+        result = {
+            'count': self.count,
+            'mean': round(self.total / self.count, 3),
+            'min': self.min,
+            'max': self.max
+        }
+        for q in quantiles:
+            result['p%g' % (q * 100)] = round(self.quantile(q), 3)
+        return result
+
+
+class TelemetrySlot:
+    """Aggregates for one fixed-width time slot"""
+
+    __slots__ = ('epoch', 'reports', 'doodles', 'fps', 'issues')
+
+    def __init__(self, epoch):
+        self.epoch = epoch
+        self.reports = 0
+        self.doodles = QuantileSketch()
+        self.fps = QuantileSketch()
+        self.issues = collections.Counter()
+
+
+class TelemetryAggregator:
+    """
+    Lock-protected ring buffer of telemetry slots with windowed rollups
+    With the defaults, 360 ten-second slots cover the longest (1h) window
+    """
+
+    windows = {'1m': 60, '5m': 300, '1h': 3600}
+
+    def __init__(self, slot_seconds=10, horizon_seconds=3600, max_issue_types=32, clock=time.time):
+        self.slot_seconds = slot_seconds
+        self.slots = [None] * math.ceil(horizon_seconds / slot_seconds)
+        self.max_issue_types = max_issue_types
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.total_reports = 0
+
+    def _slot(self, epoch):
+        index = epoch % len(self.slots)
+        slot = self.slots[index]
+        if slot is None or slot.epoch != epoch:
+            slot = self.slots[index] = TelemetrySlot(epoch)
+        return slot
+
+    def record(self, count=None, fps=None, issues=()):
+        """Fold one client report into the current slot"""
+        epoch = int(self.clock() // self.slot_seconds)
+        with self.lock:
+            slot = self._slot(epoch)
+            slot.reports += 1
+            self.total_reports += 1
+            if count is not None:
+                slot.doodles.add(count)
+            if fps is not None:
+                slot.fps.add(fps)
+            for issue in issues:
+                issue = str(issue)[:64]
+                if issue not in slot.issues and len(slot.issues) >= self.max_issue_types:
+                    issue = 'other'
+                slot.issues[issue] += 1
+
+    def rollup(self, seconds):
+        """Merge every slot that falls inside the last `seconds`"""
+        now_epoch = int(self.clock() // self.slot_seconds)
+        oldest = now_epoch - math.ceil(seconds / self.slot_seconds) + 1
+        doodles, fps, issues, reports = QuantileSketch(), QuantileSketch(), collections.Counter(), 0
+        with self.lock:
+            for slot in self.slots:
+                if slot is None or not oldest <= slot.epoch <= now_epoch:
+                    continue
+                reports += slot.reports
+                doodles.merge(slot.doodles)
+                fps.merge(slot.fps)
+                issues.update(slot.issues)
+        return {
+            'reports': reports,
+            'active_doodles': doodles.summary(),
+            'fps': fps.summary(),
+            'issues': dict(issues.most_common(self.max_issue_types))
+        }
+
+    def stats(self):
+        """Rollups for every configured window"""
+        return {name: self.rollup(seconds) for name, seconds in self.windows.items()}
+
+
+class ClientReport:
+    """Smoothed performance state for one client"""
+
+    __slots__ = ('fps', 'count', 'mobile', 'updated')
+
+    def __init__(self, fps, count, mobile, updated):
+        self.fps = fps
+        self.count = count
+        self.mobile = mobile
+        self.updated = updated
+
+
+class ClientPerformanceTable:
+    """
+    Bounded LRU table of recent per-client performance reports
+    FPS is smoothed with an exponentially weighted moving average so a single
+    janky frame window does not swing the client's budget
+    """
+
+    def __init__(self, max_clients=4096, ttl_seconds=1800, smoothing=0.5, clock=time.time):
+        self.max_clients = max_clients
+        self.ttl_seconds = ttl_seconds
+        self.smoothing = smoothing
+        self.clock = clock
+        self.clients = collections.OrderedDict()
+        self.lock = threading.Lock()
+
+    def record(self, client_id, fps=None, count=None, mobile=False):
+        """Fold a report into the client's entry, evicting the least recent clients"""
+        now = self.clock()
+        with self.lock:
+            report = self.clients.get(client_id)
+            if report is None or now - report.updated > self.ttl_seconds:
+                report = ClientReport(fps, count, mobile, now)
+            else:
+                if fps is not None:
+                    report.fps = fps if report.fps is None else (
+                        self.smoothing * fps + (1 - self.smoothing) * report.fps
+                    )
+                if count is not None:
+                    report.count = count
+                report.mobile = mobile
+                report.updated = now
+            self.clients[client_id] = report
+            self.clients.move_to_end(client_id)
+            while len(self.clients) > self.max_clients:
+                self.clients.popitem(last=False)
+
+    def get(self, client_id):
+        """Latest unexpired report for a client, or None"""
+        with self.lock:
+            report = self.clients.get(client_id)
+            if report is None:
+                return None
+            if self.clock() - report.updated > self.ttl_seconds:
+                del self.clients[client_id]
+                return None
+            return report
+
+    def __len__(self):
+        return len(self.clients)
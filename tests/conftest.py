@@ -0,0 +1,18 @@
+import pytest
+
+import app as app_module
+
+
+@pytest.fixture
+def app(monkeypatch):
+    """The site app with an empty page cache that re-checks fingerprints on every request"""
+    monkeypatch.setattr(app_module.page_cache, 'check_interval', 0)
+    app_module.page_cache.clear()
+    app_module.app.config['TESTING'] = True
+    yield app_module.app
+    app_module.page_cache.clear()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
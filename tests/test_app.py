@@ -0,0 +1,137 @@
+import base64
+import threading
+import time
+
+import app as app_module
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'timed out'
+        time.sleep(0.01)
+
+
+def cached_home(client):
+    """Prime the cache (the cold render is streamed) and return a cached response"""
+    client.get('/').get_data()
+    wait_for(lambda: app_module.page_cache.peek('home') is not None)
+    return client.get('/')
+
+
+def test_home_revalidates_with_its_etag(client):
+    response = cached_home(client)
+    assert response.status_code == 200
+    etag = response.headers['ETag']
+
+    revalidated = client.get('/', headers={'If-None-Match': etag})
+    assert revalidated.status_code == 304
+    assert revalidated.get_data() == b''
+    assert revalidated.headers['ETag'] == etag
+    assert 'Accept-Encoding' in revalidated.headers['Vary']
+
+
+def test_home_revalidates_with_last_modified(client):
+    response = cached_home(client)
+    revalidated = client.get('/', headers={'If-Modified-Since': response.headers['Last-Modified']})
+    assert revalidated.status_code == 304
+
+
+def test_encoded_etag_revalidates_against_the_same_page(client):
+    cached_home(client)
+    response = client.get('/', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    etag = response.headers['ETag']
+    assert etag.endswith('-gzip"')
+
+    revalidated = client.get('/', headers={'If-None-Match': etag, 'Accept-Encoding': 'gzip'})
+    assert revalidated.status_code == 304
+    assert revalidated.headers['ETag'] == etag
+
+
+def test_unknown_etag_gets_the_full_page(client):
+    cached_home(client)
+    response = client.get('/', headers={'If-None-Match': '"something-else"'})
+    assert response.status_code == 200
+    assert response.get_data()
+
+
+def test_stale_page_is_served_with_its_own_etag(client, monkeypatch):
+    old = cached_home(client)
+    old_etag = old.headers['ETag']
+
+    release = threading.Event()
+
+    def slow_stream():
+        release.wait(5)
+        yield '<html>new</html>'
+
+    monkeypatch.setattr(app_module, 'home_fingerprint', lambda: 'changed')
+    monkeypatch.setattr(app_module, 'stream_home', slow_stream)
+
+    # The old bytes go out while the new page renders - under the old ETag,
+    # and a client holding that ETag must not be told the new page is unchanged
+    stale = client.get('/', headers={'If-None-Match': old_etag})
+    assert stale.status_code == 200
+    assert stale.get_data() == old.get_data()
+    assert stale.headers['ETag'] == old_etag
+
+    release.set()
+    wait_for(lambda: app_module.page_cache.peek('home').fingerprint == 'changed')
+    fresh = client.get('/', headers={'If-None-Match': old_etag})
+    assert fresh.status_code == 200
+    assert fresh.get_data() == b'<html>new</html>'
+    assert fresh.headers['ETag'] != old_etag
+    assert client.get('/', headers={'If-None-Match': fresh.headers['ETag']}).status_code == 304
+
+
+def test_seeded_doodle_page_revalidates(client):
+    response = client.get('/api/doodles?seed=s&count=3')
+    assert response.status_code == 200
+    revalidated = client.get('/api/doodles?seed=s&count=3', headers={'If-None-Match': response.headers['ETag']})
+    assert revalidated.status_code == 304
+
+
+def test_seeded_doodle_body_is_stable_under_its_strong_etag(client):
+    for query in ('seed=s&count=3&offset=2', 'seed=s&count=3&offset=2&v=2'):
+        first = client.get(f'/api/doodles?{query}')
+        app_module.doodle_cache.clear()
+        time.sleep(0.01)
+        second = client.get(f'/api/doodles?{query}')
+        assert not first.headers['ETag'].startswith('W/')
+        assert second.headers['ETag'] == first.headers['ETag']
+        assert second.get_data() == first.get_data()
+
+
+def test_doodle_offset_page_is_a_slice_of_the_stream():
+    whole = app_module.sample_indexed_doodle_columns('seed', 0, 12)
+    page = app_module.sample_indexed_doodle_columns('seed', 7, 5)
+    assert page == {name: column[7:] for name, column in whole.items()}
+    assert app_module.sample_indexed_doodle_columns('seed', 0, 0) == {name: [] for name in app_module.doodle_columns}
+
+
+def test_doodle_pages_follow_the_cursor(client):
+    whole = client.get('/api/doodles?seed=s&count=8').get_json()['doodles']
+    first = client.get('/api/doodles?seed=s&count=3').get_json()
+    second = client.get(f"/api/doodles?cursor={first['next_cursor']}&count=5").get_json()
+    by_offset = client.get('/api/doodles?seed=s&count=5&offset=3').get_json()
+    assert first['doodles'] + second['doodles'] == whole
+    assert by_offset['doodles'] == whole[3:]
+
+
+def test_doodle_count_is_clamped(client):
+    body = client.get(f'/api/doodles?seed=s&count={app_module.doodle_max_count * 100}').get_json()
+    assert body['count'] == app_module.doodle_max_count
+    assert client.get('/api/doodles?count=10000000').get_json()['count'] <= app_module.doodle_max_count
+
+
+def test_cursor_positions_must_be_integers(client):
+    for position in ('["s",true,null]', '["s",0,false]', '["s",1.5,null]'):
+        cursor = base64.urlsafe_b64encode(position.encode()).decode().rstrip('=')
+        assert app_module.decode_doodle_cursor(cursor) is None
+        assert client.get(f'/api/doodles?cursor={cursor}').status_code == 400
+    assert app_module.decode_doodle_cursor(app_module.encode_doodle_cursor('s', 3, 2)) == ('s', 3, 2)
+
+
+def test_missing_static_file_is_a_404(client):
+    assert client.get('/static/css/missing.css').status_code == 404
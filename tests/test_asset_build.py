@@ -0,0 +1,54 @@
+import pytest
+
+from asset_build import minify_css, minify_js
+
+
+@pytest.mark.parametrize('source, expected', [
+    ("const a = 'it\\'s // not a comment';", "const a='it\\'s // not a comment';\n"),
+    ('const b = "/* not a comment */";', 'const b="/* not a comment */";\n'),
+    ('const c = `line one\n    ${value /* inside */} // kept`;', 'const c=`line one\n    ${value } // kept`;\n'),
+    ('const d = `outer ${`inner ${x}`} // kept`;', 'const d=`outer ${`inner ${x}`} // kept`;\n'),
+])
+def test_js_strings_and_templates_are_copied_verbatim(source, expected):
+    assert minify_js(source) == expected
+
+
+def test_js_comments_are_removed():
+    source = '// header\nlet a = 1; /* inline */ let b = 2;\n/*\n block\n*/\nlet c = 3;\n'
+    assert minify_js(source) == 'let a=1;let b=2;\nlet c=3;\n'
+
+
+def test_js_comment_between_words_keeps_them_apart():
+    assert minify_js('return/* why */value;') == 'return value;\n'
+
+
+@pytest.mark.parametrize('source, regex', [
+    ('const r = /a\\/b/g;', '/a\\/b/g'),
+    ('const r = /[/]* not a comment/;', '/[/]* not a comment/'),
+    ('if (x) return /\\d+ \\/\\/ two slashes/i.test(s);', '/\\d+ \\/\\/ two slashes/i'),
+    ('f(a, /"/);', '/"/'),
+])
+def test_js_regexes_are_copied_verbatim(source, regex):
+    assert regex in minify_js(source)
+
+
+def test_js_division_is_not_a_regex():
+    assert minify_js('const half = total / 2 / count; // trailing') == 'const half=total / 2 / count;\n'
+
+
+def test_js_line_breaks_are_kept_for_semicolon_insertion():
+    assert minify_js('let a = 1\nlet b = a\n(function () {})()\n') == 'let a=1\nlet b=a\n(function(){})()\n'
+
+
+def test_css_comments_and_whitespace_are_removed():
+    source = '/* header */\n.a ,\n.b > .c {\n  color : red ;\n  margin: 0 auto;\n}\n'
+    assert minify_css(source) == '.a,.b>.c{color :red;margin:0 auto}\n'
+
+
+def test_css_strings_are_copied_verbatim():
+    source = '.a::before { content: "/* not a comment */  ;  }"; }\n.b { font-family: \'A  B\'; }'
+    assert minify_css(source) == '.a::before{content:"/* not a comment */  ;  }"}.b{font-family:\'A  B\'}\n'
+
+
+def test_css_descendant_pseudo_class_keeps_its_space():
+    assert minify_css('nav :hover { color: blue; }') == 'nav :hover{color:blue}\n'
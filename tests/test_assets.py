@@ -0,0 +1,44 @@
+import hashlib
+
+from assets import AssetManifest, hashed_name
+from static_server import StaticTable
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def short_hash(data):
+    return hashlib.sha256(data).hexdigest()[:10]
+
+
+def test_manifest_names_files_by_content_hash(tmp_path):
+    (tmp_path / 'css').mkdir()
+    (tmp_path / 'css' / 'site.css').write_bytes(b'body{}')
+    manifest = AssetManifest(StaticTable(str(tmp_path)))
+
+    hashed = hashed_name('css/site.css', short_hash(b'body{}'))
+    assert manifest.url_name('css/site.css') == hashed
+    assert manifest.resolve(hashed) == ('css/site.css', True)
+    assert manifest.resolve('css/site.0123456789.css') == ('css/site.css', False)
+    assert manifest.resolve('css/other.css') == ('css/other.css', False)
+
+
+def test_manifest_follows_the_static_table(tmp_path):
+    clock = Clock()
+    path = tmp_path / 'app.js'
+    path.write_bytes(b'let a = 1;')
+    table = StaticTable(str(tmp_path), check_interval=1.0, clock=clock)
+    manifest = AssetManifest(table)
+    version = manifest.current_version()
+
+    path.write_bytes(b'let a = 2; // changed')
+    assert manifest.current_version() == version  # not re-checked yet
+    clock.now = 2.0
+    assert manifest.current_version() != version
+    assert manifest.url_name('app.js') == hashed_name('app.js', short_hash(b'let a = 2; // changed'))
+    assert manifest.url_name('app.js').startswith('app.' + table.get('app.js').etag[:10])
@@ -0,0 +1,68 @@
+import gzip
+import zlib
+
+import pytest
+
+import compression
+from compression import compress_stream, compress_variants, negotiate_encoding, parse_accept_encoding
+
+
+@pytest.fixture
+def with_brotli(monkeypatch):
+    """Negotiate as if the optional brotli package were installed"""
+    monkeypatch.setattr(compression, 'SUPPORTED_ENCODINGS', ('br', 'gzip'))
+
+
+BOTH = ('br', 'gzip')
+
+
+@pytest.mark.parametrize('header, expected', [
+    ('gzip', 'gzip'),
+    ('gzip;q=0', None),
+    ('gzip;q=0, *', None),
+    ('*;q=0', None),
+    ('*;q=0, gzip', 'gzip'),
+    ('*', 'gzip'),
+    ('identity', None),
+    ('', None),
+    (None, None),
+    ('GZIP ; q=0.5', 'gzip'),
+    ('gzip;q=nonsense', None),
+])
+def test_q_values(header, expected):
+    assert negotiate_encoding(header, ('gzip',)) == expected
+
+
+def test_br_wins_a_tie(with_brotli):
+    assert negotiate_encoding('gzip, br', BOTH) == 'br'
+    assert negotiate_encoding('br;q=0.8, gzip;q=0.8', BOTH) == 'br'
+    assert negotiate_encoding('*', BOTH) == 'br'
+
+
+def test_higher_q_value_wins(with_brotli):
+    assert negotiate_encoding('br;q=0.5, gzip;q=0.8', BOTH) == 'gzip'
+    assert negotiate_encoding('br;q=0, gzip', BOTH) == 'gzip'
+    assert negotiate_encoding('*;q=0.1, gzip;q=0', BOTH) == 'br'
+
+
+def test_only_available_variants_are_chosen(with_brotli):
+    assert negotiate_encoding('br, gzip', ('gzip',)) == 'gzip'
+    assert negotiate_encoding('br', ('gzip',)) is None
+    assert negotiate_encoding('identity', BOTH) is None
+
+
+def test_parse_accept_encoding():
+    assert parse_accept_encoding('gzip;q=0.5, br, *;q=0') == {'gzip': 0.5, 'br': 1.0, '*': 0.0}
+
+
+def test_variants_skip_small_bodies():
+    assert compress_variants(b'tiny') == {}
+    body = b'repetitive text ' * 200
+    assert gzip.decompress(compress_variants(body)['gzip']) == body
+
+
+def test_stream_decodes_chunk_by_chunk():
+    chunks = list(compress_stream(['<head>', '</head>', 'body' * 100], 'gzip'))
+    decoder = zlib.decompressobj(31)
+    assert decoder.decompress(chunks[0]) == b'<head>'
+    assert b''.join(decoder.decompress(chunk) for chunk in chunks[1:]) == b'</head>' + b'body' * 100
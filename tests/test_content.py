@@ -0,0 +1,105 @@
+import json
+import os
+import shutil
+
+import pytest
+
+import app as app_module
+from content import BadgeCategory, ContentFile, ContentStore, Experience
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def write_json(path, data, mtime_ns=None):
+    path.write_text(json.dumps(data), encoding='utf-8')
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+EXPERIENCE = {'title': 'Engineer', 'date': '2024', 'company': 'Acme', 'description': 'Builds things'}
+
+
+@pytest.fixture
+def experience_file(tmp_path):
+    path = tmp_path / 'experience.json'
+    write_json(path, [EXPERIENCE], mtime_ns=1_000_000_000)
+    return path
+
+
+def test_records_are_read_only_with_defaults(experience_file):
+    record = ContentFile(str(experience_file), Experience).records()[0]
+    assert record.title == 'Engineer'
+    assert record.animation is None
+    with pytest.raises(AttributeError):
+        record.title = 'Manager'
+
+
+def test_edited_file_is_picked_up_after_the_check_interval(experience_file):
+    clock = Clock()
+    content = ContentFile(str(experience_file), Experience, check_interval=1.0, clock=clock)
+    fingerprint = content.fingerprint()
+
+    write_json(experience_file, [dict(EXPERIENCE, title='Lead engineer')], mtime_ns=2_000_000_000)
+    clock.now = 0.5
+    assert content.records()[0].title == 'Engineer'
+
+    clock.now = 1.5
+    assert content.records()[0].title == 'Lead engineer'
+    assert content.fingerprint() != fingerprint
+
+
+def test_malformed_file_keeps_the_last_good_content(experience_file, caplog):
+    clock = Clock()
+    content = ContentFile(str(experience_file), Experience, check_interval=1.0, clock=clock)
+    snapshot = content.current()
+
+    experience_file.write_text('[{"title": "Engin', encoding='utf-8')
+    os.utime(experience_file, ns=(2_000_000_000, 2_000_000_000))
+    clock.now = 1.5
+    assert content.current() is snapshot
+    assert 'keeping the previous content' in caplog.text
+
+    write_json(experience_file, [{'title': 'No other fields'}], mtime_ns=3_000_000_000)
+    clock.now = 3.0
+    assert content.current() is snapshot
+
+    write_json(experience_file, [dict(EXPERIENCE, company='Globex')], mtime_ns=4_000_000_000)
+    clock.now = 4.5
+    assert content.records()[0].company == 'Globex'
+
+
+def test_store_fingerprints_each_file(tmp_path):
+    write_json(tmp_path / 'experience.json', [EXPERIENCE])
+    write_json(tmp_path / 'badges.json', [])
+    store = ContentStore(str(tmp_path), {'experience': Experience, 'badges': BadgeCategory}, check_interval=0)
+    combined, badges = store.fingerprint(), store.fingerprint('badges')
+
+    write_json(tmp_path / 'experience.json', [EXPERIENCE, EXPERIENCE], mtime_ns=5_000_000_000)
+    assert len(store.context()['experience']) == 2
+    assert store.fingerprint('badges') == badges
+    assert store.fingerprint() != combined
+
+
+def test_requests_keep_serving_the_last_good_content(client, monkeypatch, tmp_path):
+    root = tmp_path / 'content'
+    shutil.copytree(app_module.content_root, root)
+    monkeypatch.setattr(app_module, 'content_store', ContentStore(str(root), check_interval=0))
+    experience = json.loads((root / 'experience.json').read_text(encoding='utf-8'))
+
+    experience[0]['title'] = 'Edited title'
+    write_json(root / 'experience.json', experience, mtime_ns=6_000_000_000)
+    response = client.get('/fragments/experience')
+    assert response.status_code == 200
+    assert b'Edited title' in response.get_data()
+
+    (root / 'experience.json').write_text('[{"title": ', encoding='utf-8')
+    os.utime(root / 'experience.json', ns=(7_000_000_000, 7_000_000_000))
+    response = client.get('/fragments/experience')
+    assert response.status_code == 200
+    assert b'Edited title' in response.get_data()
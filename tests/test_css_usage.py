@@ -0,0 +1,66 @@
+from css_usage import CssUsage, RuntimeNames
+
+
+PAGE = '''<html><body>
+<nav class="navbar"><a class="nav-link" href="#home">Home</a></nav>
+<div class="embedded-badge-wrapper"><div data-share-badge-id="1"></div></div>
+</body></html>'''
+
+SCRIPT = '''
+const wrapper = document.querySelector('.embedded-badge-wrapper');
+const iframe = wrapper.querySelector('iframe');
+card.classList.add('is-flipped');
+toast.className = `notification-${type}`;
+'''
+
+
+def prune(css, scripts=(SCRIPT,), pages=(PAGE,)):
+    return CssUsage(list(pages), list(scripts)).prune({'site.css': css})['site.css']
+
+
+def test_rules_for_markup_on_the_page_are_kept():
+    assert prune('.navbar .nav-link { color: red; }') == '.navbar .nav-link{color:red}\n'
+
+
+def test_rules_nothing_can_match_are_dropped():
+    assert prune('.navbar .missing { color: red; } .unused { color: blue; }') == ''
+
+
+def test_runtime_classes_and_prefixes_are_kept():
+    css = '.is-flipped { transform: none; } .notification-error { color: red; } .never-added { color: blue; }'
+    assert prune(css) == '.is-flipped{transform:none}.notification-error{color:red}\n'
+
+
+def test_tags_created_by_scripts_are_kept():
+    """Embeds add their iframe after load, so it is absent from the rendered page"""
+    css = ('.embedded-badge-wrapper iframe { max-width: 100%; height: auto; }\n'
+           '.embedded-badge-wrapper:hover iframe { transform: scale(1.02); }\n'
+           '.embedded-badge-wrapper video { display: none; }')
+    assert prune(css) == ('.embedded-badge-wrapper iframe{max-width:100%;height:auto}'
+                          '.embedded-badge-wrapper:hover iframe{transform:scale(1.02)}\n')
+
+
+def test_tags_are_not_kept_without_a_script():
+    assert prune('.embedded-badge-wrapper iframe { max-width: 100%; }', scripts=()) == ''
+
+
+def test_inline_scripts_of_the_pages_count():
+    page = PAGE.replace('</body>', '<script>el.classList.add("menu-open")</script></body>')
+    assert prune('.menu-open { overflow: hidden; }', scripts=(), pages=(page,)) == '.menu-open{overflow:hidden}\n'
+
+
+def test_keyframes_are_kept_only_when_referenced():
+    css = ('.navbar { animation: slide 1s; } @keyframes slide { to { opacity: 1; } }'
+           ' @keyframes unused { to { opacity: 0; } }')
+    pruned = prune(css)
+    assert '@keyframes slide' in pruned
+    assert '@keyframes unused' not in pruned
+
+
+def test_runtime_names():
+    names = RuntimeNames(["el.classList.add('open'); document.createElement('CANVAS'); `toast-${kind}`"])
+    assert names.has('open')
+    assert names.has('toast-info')
+    assert not names.has('closed')
+    assert names.has_tag('canvas')
+    assert not names.has_tag('video')
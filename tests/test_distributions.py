@@ -0,0 +1,67 @@
+import collections
+import random
+
+import pytest
+
+from distributions import AliasDistribution, CounterRandom, fnv1a_32
+
+
+SPEC = {'a': 5, 'b': 3, 'c': 1, 'd': 1}
+
+
+def test_alias_sample_frequencies_match_weights():
+    distribution = AliasDistribution(SPEC)
+    draws = 200_000
+    counts = collections.Counter(distribution.sample_many(random.Random(7), draws))
+    for value, probability in distribution.probabilities().items():
+        assert counts[value] / draws == pytest.approx(probability, abs=0.01)
+
+
+def test_alias_sample_and_sample_many_agree():
+    distribution = AliasDistribution(SPEC)
+    rng = random.Random(3)
+    singles = [distribution.sample(rng) for _ in range(50)]
+    assert distribution.sample_many(random.Random(3), 50) == singles
+
+
+def test_pick_follows_running_weights():
+    distribution = AliasDistribution(SPEC)
+    steps = 1000
+    counts = collections.Counter(distribution.pick(step / steps) for step in range(steps))
+    assert counts == {'a': 500, 'b': 300, 'c': 100, 'd': 100}
+    assert distribution.pick(0.0) == 'a'
+    assert distribution.pick(0.9999999) == 'd'
+
+
+def test_zero_weight_values_are_never_drawn():
+    distribution = AliasDistribution([('never', 0), ('always', 2)])
+    assert set(distribution.sample_many(random.Random(1), 1000)) == {'always'}
+
+
+@pytest.mark.parametrize('spec', [{}, {'a': -1, 'b': 2}, {'a': 0}])
+def test_invalid_specs_are_rejected(spec):
+    with pytest.raises(ValueError):
+        AliasDistribution(spec)
+
+
+def test_fnv1a_32_reference_values():
+    assert fnv1a_32('') == 0x811c9dc5
+    assert fnv1a_32('a') == 0xe40c292c
+    assert fnv1a_32('foobar') == 0xbf9cf968
+
+
+def test_counter_random_stream_depends_only_on_key_and_index():
+    first = CounterRandom('seed', 42)
+    values = [first.random() for _ in range(5)]
+    CounterRandom('seed', 7).random()
+    again = CounterRandom('seed', 42)
+    assert [again.random() for _ in range(5)] == values
+    assert all(0.0 <= value < 1.0 for value in values)
+    assert CounterRandom('seed', 43).random() != values[0]
+
+
+def test_counter_random_reseed_restarts_the_stream():
+    rng = CounterRandom('seed', 3)
+    values = [rng.random() for _ in range(3)]
+    rng.seed()
+    assert [rng.random() for _ in range(3)] == values
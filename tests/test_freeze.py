@@ -0,0 +1,88 @@
+import json
+import os
+import shutil
+
+import pytest
+
+import app as app_module
+from content import ContentStore
+from freeze import STATE_NAME, Freezer, FreezeOutput
+
+
+def freeze(output_dir, doodle_shards=4):
+    written = []
+    counts = Freezer(str(output_dir), log=written.append).run(
+        app_module.freeze_outputs(doodle_shards), app_module.freeze_inputs(doodle_shards))
+    return counts, [line.split()[0] for line in written if not line.strip().startswith('removed')]
+
+
+@pytest.fixture
+def content_root(app, monkeypatch, tmp_path):
+    root = tmp_path / 'content'
+    shutil.copytree(app_module.content_root, root)
+    monkeypatch.setattr(app_module, 'content_store', ContentStore(str(root), check_interval=0))
+    return root
+
+
+def test_incremental_export(content_root, tmp_path):
+    output = tmp_path / 'build'
+    counts, written = freeze(output)
+    assert counts['written'] == len(written) > 0
+    assert (output / 'index.html').exists()
+    assert (output / 'fragments' / 'experience').exists()
+    state = json.loads((output / STATE_NAME).read_text(encoding='utf-8'))
+    assert state['outputs']['fragments/experience']['content_type'].startswith('text/html')
+
+    counts, written = freeze(output)
+    assert counts == {'written': 0, 'skipped': counts['skipped'], 'removed': 0}
+    assert written == []
+
+    path = content_root / 'experience.json'
+    experience = json.loads(path.read_text(encoding='utf-8'))
+    experience[0]['title'] = 'Edited title'
+    path.write_text(json.dumps(experience), encoding='utf-8')
+    os.utime(path, ns=(9_000_000_000, 9_000_000_000))
+    counts, written = freeze(output)
+    assert written == ['fragments/experience']
+    assert b'Edited title' in (output / 'fragments' / 'experience').read_bytes()
+
+    shards = sorted(os.listdir(output / 'api' / 'doodles' / 'shards'))
+    shard_dir = output / 'api' / 'doodles' / 'shards' / shards[0]
+    counts, written = freeze(output, doodle_shards=2)
+    assert counts['removed'] == 2
+    # Removed shards lose their precompressed variants too
+    assert {name.split('.')[0] for name in os.listdir(shard_dir)} == {'0', '15'}
+    assert 'next' not in json.loads((shard_dir / '15.json').read_bytes())
+
+
+def test_freezer_rebuilds_only_changed_outputs_and_deletes_removed_ones(tmp_path):
+    text = 'text/plain; charset=utf-8'
+    builds = []
+
+    def output(path, inputs, data):
+        return FreezeOutput(path, inputs, lambda: builds.append(path) or data, text)
+
+    big = b'compressible text ' * 100
+    freezer = Freezer(str(tmp_path), log=lambda line: None)
+    first = [output('a.txt', ['x'], big), output('dir/b.txt', ['y'], b'b'), output('c.txt', ['x', 'y'], b'c')]
+    assert freezer.run(first, {'x': '1', 'y': '1'}) == {'written': 3, 'skipped': 0, 'removed': 0}
+    assert (tmp_path / 'a.txt.gz').exists()
+
+    builds.clear()
+    assert freezer.run(first, {'x': '1', 'y': '2'}) == {'written': 2, 'skipped': 1, 'removed': 0}
+    assert builds == ['dir/b.txt', 'c.txt']
+
+    builds.clear()
+    assert freezer.run(first[1:], {'x': '1', 'y': '2'}) == {'written': 0, 'skipped': 2, 'removed': 1}
+    assert not (tmp_path / 'a.txt').exists()
+    assert not (tmp_path / 'a.txt.gz').exists()
+    assert builds == []
+
+    (tmp_path / 'c.txt').unlink()
+    assert freezer.run(first[1:], {'x': '1', 'y': '2'})['written'] == 1
+    assert builds == ['c.txt']
+
+
+def test_unknown_inputs_are_an_error(tmp_path):
+    with pytest.raises(KeyError):
+        Freezer(str(tmp_path)).run([FreezeOutput('a.txt', ['missing'], lambda: b'a', 'text/plain')], {})
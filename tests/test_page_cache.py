@@ -0,0 +1,128 @@
+import threading
+import time
+
+from page_cache import PageCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_hit_while_fingerprint_is_unchanged():
+    cache = PageCache(check_interval=0)
+    renders = []
+    render = lambda: renders.append(1) or 'page'
+    first = cache.get_or_render('home', lambda: 'v1', render)
+    second = cache.get_or_render('home', lambda: 'v1', render)
+    assert second is first
+    assert first.body == b'page'
+    assert len(renders) == 1
+
+
+def test_fingerprint_is_recomputed_once_per_interval():
+    clock = Clock()
+    cache = PageCache(check_interval=1.0, clock=clock)
+    calls = []
+    compute = lambda: calls.append(1) or 'v1'
+    cache.fingerprint('home', compute)
+    cache.fingerprint('home', compute)
+    assert len(calls) == 1
+    clock.now = 1.5
+    cache.fingerprint('home', compute)
+    assert len(calls) == 2
+
+
+def test_concurrent_cold_misses_share_one_render():
+    cache = PageCache(check_interval=0)
+    started, release = threading.Event(), threading.Event()
+    renders = []
+
+    def render():
+        renders.append(1)
+        started.set()
+        release.wait(5)
+        return 'page'
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(cache.get_or_render('home', lambda: 'v1', render)))
+    leader.start()
+    assert started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(cache.get_or_render('home', lambda: 'v1', render)))
+                 for _ in range(4)]
+    for thread in followers:
+        thread.start()
+    while cache.stats()['coalesced'] < len(followers):
+        time.sleep(0.001)
+    release.set()
+    for thread in [leader] + followers:
+        thread.join(5)
+
+    assert len(renders) == 1
+    assert len(results) == 5
+    assert all(entry is results[0] for entry in results)
+
+
+def test_render_error_reaches_every_waiter_and_is_not_cached():
+    cache = PageCache(check_interval=0)
+
+    def fail():
+        raise RuntimeError('boom')
+
+    for _ in range(2):
+        try:
+            cache.get_or_render('home', lambda: 'v1', fail)
+        except RuntimeError as error:
+            assert str(error) == 'boom'
+        else:
+            raise AssertionError('render error was swallowed')
+    assert cache.peek('home') is None
+
+
+def test_stale_entry_is_served_while_one_background_render_runs():
+    cache = PageCache(check_interval=0)
+    old = cache.get_or_render('home', lambda: 'v1', lambda: 'old')
+    release, renders = threading.Event(), []
+
+    def render():
+        renders.append(1)
+        release.wait(5)
+        return 'new'
+
+    assert cache.get_or_render('home', lambda: 'v2', render) is old
+    assert cache.get_or_render('home', lambda: 'v2', render) is old
+    assert cache.stats()['stale_hits'] == 2
+
+    release.set()
+    for _ in range(500):
+        if cache.peek('home').fingerprint == 'v2':
+            break
+        time.sleep(0.01)
+    fresh = cache.get_or_render('home', lambda: 'v2', render)
+    assert fresh.body == b'new'
+    assert len(renders) == 1
+
+
+def test_peek_exposes_the_stale_entry_being_served():
+    """Validators must come from peek's entry, not the new fingerprint"""
+    cache = PageCache(check_interval=0)
+    cache.get_or_render('home', lambda: 'v1', lambda: 'old')
+    release = threading.Event()
+    served = cache.get_or_render('home', lambda: 'v2', lambda: release.wait(5) and 'new')
+    assert served.fingerprint == 'v1'
+    assert cache.peek('home') is served
+    release.set()
+
+
+def test_stream_caches_the_page_once_consumed():
+    cache = PageCache(check_interval=0)
+    entry, chunks = cache.get_or_stream('home', lambda: 'v1', lambda: iter(['<head>', '</head>', 'body']))
+    assert entry is None
+    assert chunks.fingerprint == 'v1'
+    assert ''.join(chunks) == '<head></head>body'
+    entry, chunks = cache.get_or_stream('home', lambda: 'v1', lambda: iter(['other']))
+    assert chunks is None
+    assert entry.body == b'<head></head>body'
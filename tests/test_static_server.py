@@ -0,0 +1,92 @@
+import pytest
+from werkzeug.test import Client
+from werkzeug.wrappers import Response
+
+from static_server import StaticMiddleware, StaticTable
+
+
+BODY = bytes(range(256)) * 4
+TEXT = ('body { color: red; }\n' * 100).encode('utf-8')
+
+
+def fallback(environ, start_response):
+    return Response('fallback', status=404)(environ, start_response)
+
+
+@pytest.fixture
+def client(tmp_path):
+    (tmp_path / 'data.bin').write_bytes(BODY)
+    (tmp_path / 'site.css').write_bytes(TEXT)
+    (tmp_path / 'large.bin').write_bytes(BODY * 8)
+    table = StaticTable(str(tmp_path), memory_max_size=4096)
+    return Client(StaticMiddleware(fallback, table, '/static', max_age=lambda filename: 60))
+
+
+def test_full_response(client):
+    response = client.get('/static/data.bin')
+    assert response.status_code == 200
+    assert response.get_data() == BODY
+    assert response.headers['Accept-Ranges'] == 'bytes'
+    assert response.headers['Cache-Control'] == 'public, max-age=60'
+
+
+def test_unknown_file_falls_through(client):
+    response = client.get('/static/missing.bin')
+    assert response.status_code == 404
+    assert response.get_data() == b'fallback'
+
+
+@pytest.mark.parametrize('header, start, end', [
+    ('bytes=0-9', 0, 10),
+    ('bytes=100-', 100, len(BODY)),
+    ('bytes=-16', len(BODY) - 16, len(BODY)),
+    ('bytes=1000-5000', 1000, len(BODY)),
+])
+def test_single_range(client, header, start, end):
+    response = client.get('/static/data.bin', headers={'Range': header})
+    assert response.status_code == 206
+    assert response.get_data() == BODY[start:end]
+    assert response.headers['Content-Range'] == f'bytes {start}-{end - 1}/{len(BODY)}'
+    assert response.headers['Content-Length'] == str(end - start)
+
+
+def test_range_of_a_file_kept_on_disk(client):
+    response = client.get('/static/large.bin', headers={'Range': 'bytes=6000-6099'})
+    assert response.status_code == 206
+    assert response.get_data() == (BODY * 8)[6000:6100]
+
+
+def test_unsatisfiable_range(client):
+    response = client.get('/static/data.bin', headers={'Range': f'bytes={len(BODY)}-'})
+    assert response.status_code == 416
+    assert response.headers['Content-Range'] == f'bytes */{len(BODY)}'
+    assert response.get_data() == b''
+
+
+def test_if_range_with_an_old_etag_sends_the_whole_file(client):
+    response = client.get('/static/data.bin', headers={'Range': 'bytes=0-9', 'If-Range': '"old"'})
+    assert response.status_code == 200
+    assert response.get_data() == BODY
+
+    etag = client.get('/static/data.bin').headers['ETag']
+    response = client.get('/static/data.bin', headers={'Range': 'bytes=0-9', 'If-Range': etag})
+    assert response.status_code == 206
+
+
+def test_range_is_served_from_the_identity_bytes(client):
+    response = client.get('/static/site.css', headers={'Range': 'bytes=0-3', 'Accept-Encoding': 'gzip'})
+    assert response.status_code == 206
+    assert 'Content-Encoding' not in response.headers
+    assert response.get_data() == TEXT[:4]
+
+
+def test_precompressed_variant_and_revalidation(client):
+    response = client.get('/static/site.css', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.headers['Vary'] == 'Accept-Encoding'
+    etag = response.headers['ETag']
+    assert etag.endswith('-gzip"')
+
+    revalidated = client.get('/static/site.css', headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+    assert revalidated.status_code == 304
+    assert revalidated.get_data() == b''